@@ -1,825 +1,1298 @@
 #!/usr/bin/env python
+"""Analyze Aesop tactic performance.
+
+Run as a script to write the full report to stdout, or import `Analysis` to
+query the results interactively. All datasets are lazily evaluated DuckDB
+relations; per-tactic tables are only materialized by the steps that need them:
+
+    from analyze import Analysis
+    a = Analysis(Path('results'), Path('results'))
+    a.aesop.filter("tactic = 'useAesopPUnsafeNew'").df()
+    a.comparison_decls(old_tactic='useAesopPUnsafeOld', new_tactic='useAesopPUnsafeNew').count('*')
+    a.run(['exclusions', 'metrics'])
+"""
 import duckdb
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
-from statsmodels.api import nonparametric
+from statsmodels.api import nonparametric, OLS, add_constant
 import argparse
-
-plt.rcParams.update({'font.size': 18})
+import parquet_layout
+from plotting import PLOT_RC, save_plot
 
 HIGH_VARIANCE_THRESHOLD=1.2
-
-def save_plot(path: Path):
-    """Save current figure as PDF and record for plots.tex."""
-    plt.savefig(path.with_suffix('.pdf'), bbox_inches='tight')
-    plt.close()
-
-# Parse arguments
-parser = argparse.ArgumentParser(description='Analyze Aesop tactic performance')
-parser.add_argument('input_dir', type=Path, help='Input directory containing parquet files')
-parser.add_argument('output_dir', type=Path, help='Output directory for results and plots')
-args = parser.parse_args()
-
-input_dir = args.input_dir
-output_dir = args.output_dir
-
-# Create output directory
-output_dir.mkdir(parents=True, exist_ok=True)
-plots_dir = output_dir / 'plots'
-plots_dir.mkdir(exist_ok=True)
-samples_dir = output_dir / 'samples'
-samples_dir.mkdir(exist_ok=True)
-print(f"Results will be saved in {output_dir.absolute()}/")
-
-# Connect to DuckDB
-con = duckdb.connect()
-
-# Load datasets
-print("Loading datasets...")
-con.execute(f"CREATE VIEW aesop_raw AS SELECT * FROM '{input_dir / 'aesopstats.parquet'}'")
-con.execute(f"CREATE VIEW gathered_raw AS SELECT * FROM '{input_dir / 'gatheredresult.parquet'}'")
-
-# Basic stats
-gathered_stats = con.execute("""
-    SELECT
-        COUNT(*) as total_rows,
-        COUNT(DISTINCT declaration) as unique_decls
-    FROM gathered_raw
-""").fetchone()
-assert gathered_stats is not None
-print(f"gatheredresult: {gathered_stats[0]} rows, {gathered_stats[1]} declarations")
-
-aesop_stats = con.execute("""
-    SELECT
-        COUNT(*) as total_rows,
-        COUNT(DISTINCT declaration) as unique_decls
-    FROM aesop_raw
-""").fetchone()
-assert aesop_stats is not None
-print(f"aesopstats:     {aesop_stats[0]} rows, {aesop_stats[1]} declarations")
-
-# Aggregate aesop: pick run with median total time, filter inconsistent success/timeout
-con.execute(f"""
-    CREATE VIEW aesop AS
-    WITH ranked AS (
-        SELECT *,
-            ROW_NUMBER() OVER (PARTITION BY tactic, declaration ORDER BY total) as rn,
-            COUNT(*) OVER (PARTITION BY tactic, declaration) as cnt
-        FROM aesop_raw
-    )
-    SELECT
-        tactic, declaration, total, search, script, ruleSetConstruction,
-        ruleSelection, forwardState, configParsing,
-        syntax, file, goalSolved, ruleStats, goalStats
-    FROM ranked
-    WHERE rn = (cnt + 1) / 2
-        AND (tactic, declaration) IN (
-            SELECT tactic, declaration
-            FROM aesop_raw
-            GROUP BY tactic, declaration
-            HAVING min(goalSolved) = max(goalSolved)
-                AND NOT (min(total) <= 11e9 AND max(total) > 11e9)
-                AND max(total)::DOUBLE / min(total) <= {HIGH_VARIANCE_THRESHOLD}
-        )
-""")
-
-# Aggregate gathered: median time, filter inconsistent success/timeout
-con.execute(f"""
-    CREATE VIEW gathered AS
-    SELECT
-        tactic,
-        declaration,
-        first(success) as success,
-        CAST(percentile_cont(0.5) WITHIN GROUP (ORDER BY time) AS INTEGER) as time
-    FROM gathered_raw
-    GROUP BY tactic, declaration
-    HAVING min(success) = max(success)
-        AND NOT (min(time) <= 11e3 AND max(time) > 11e3)
-        AND max(time)::DOUBLE / min(time) <= {HIGH_VARIANCE_THRESHOLD}
-""")
-
-# Split data by tactic and compute metrics
-print("Splitting data by tactic and computing metrics...")
+TIMEOUT_MS=11e3
 
 aesop_tactics = ['useAesop', 'useAesopPUnsafeOld', 'useAesopPUnsafeNew']
 saturate_tactics = ['useSaturateOldDAs', 'useSaturateNewDAss']
 tactics = aesop_tactics + saturate_tactics
+tactics_of_interest = ['useAesopPUnsafeOld', 'useAesopPUnsafeNew', 'useSaturateNewDAss', 'useSaturateOldDAs']
 
-for tactic in tactics:
-    con.execute(f"CREATE TEMP TABLE gathered_{tactic} AS SELECT * FROM gathered WHERE tactic = '{tactic}'")
-    con.execute(f"""
-        CREATE TEMP TABLE aesop_{tactic} AS
-        SELECT
-            declaration,
-            total,
-            file,
-            syntax,
-            goalSolved,
-            ruleStats,
-            goalStats,
-            list_count(list_filter(ruleStats, r -> r.rule.builder = 'forward' AND r.successful)) as forward_success,
-            list_count(list_filter(ruleStats, r -> r.rule.builder = 'forward')) as forward_total,
-            list_max(list_transform(
-                flatten(list_transform(
-                    flatten(list_transform(goalStats, g -> g.forwardStateStats.ruleStateStats)),
-                    r -> r.clusterStateStats
-                )),
-                c -> len(c.instantiationStats)
-            )) as max_instantiations,
-            list_max(list_transform(goalStats, g -> g.depth)) as max_depth,
-            list_max(list_transform(goalStats, g -> g.lctxSize)) as max_lctx_size
-        FROM aesop
-        WHERE tactic = '{tactic}'
-    """)
-
-# Analyze inconsistencies
-print("\n" + "="*80)
-print("INCONSISTENCY EXCLUSIONS")
-print("="*80)
-
-for tactic in tactics:
-    # Count raw declarations
-    raw_aesop = con.execute(f"SELECT COUNT(DISTINCT declaration) FROM aesop_raw WHERE tactic = '{tactic}'").fetchone()[0]
-    raw_gathered = con.execute(f"SELECT COUNT(DISTINCT declaration) FROM gathered_raw WHERE tactic = '{tactic}'").fetchone()[0]
-
-    # Count after aggregation
-    agg_aesop = con.execute(f"SELECT COUNT(*) FROM aesop_{tactic}").fetchone()[0]
-    agg_gathered = con.execute(f"SELECT COUNT(*) FROM gathered_{tactic}").fetchone()[0]
-
-    # Aesop inconsistencies
-    aesop_inconsistent_success = con.execute(f"""
-        SELECT COUNT(*)
-        FROM (
-            SELECT declaration
-            FROM aesop_raw
-            WHERE tactic = '{tactic}'
-            GROUP BY declaration
-            HAVING min(goalSolved) != max(goalSolved)
-        )
-    """).fetchone()[0]
+# Report sections, in report order. The last group runs once per compared tactic pair.
+REPORT_STEPS = ['basic', 'exclusions', 'sanity', 'outcomes', 'censored']
+COMPARISON_STEPS = ['metrics', 'plots', 'model', 'phases', 'samples', 'rules']
+STEPS = REPORT_STEPS + COMPARISON_STEPS
 
-    aesop_inconsistent_timeout = con.execute(f"""
-        SELECT COUNT(*)
-        FROM (
-            SELECT declaration
-            FROM aesop_raw
-            WHERE tactic = '{tactic}'
-            GROUP BY declaration
-            HAVING min(total) <= 11e9 AND max(total) > 11e9
-        )
-    """).fetchone()[0]
+RULE_COSTS_TOP_N = 15
 
-    aesop_inconsistent_variance = con.execute(f"""
-        SELECT COUNT(*)
-        FROM (
-            SELECT declaration
-            FROM aesop_raw
-            WHERE tactic = '{tactic}'
-            GROUP BY declaration
-            HAVING max(total)::DOUBLE / min(total) > {HIGH_VARIANCE_THRESHOLD}
-                AND NOT (min(goalSolved) != max(goalSolved))
-                AND NOT (min(total) <= 11e9 AND max(total) > 11e9)
-        )
-    """).fetchone()[0]
+SPEEDUP_MODEL_FEATURES = ['max_instantiations', 'max_lctx_size', 'max_depth', 'forward_total', 'forward_success', 'max_clusters']
+SPEEDUP_MODEL_MIN_REGION_SIZE = 20
 
-    # Gathered inconsistencies
-    gathered_inconsistent_success = con.execute(f"""
-        SELECT COUNT(*)
-        FROM (
-            SELECT declaration
-            FROM gathered_raw
-            WHERE tactic = '{tactic}'
-            GROUP BY declaration
-            HAVING min(success) != max(success)
-        )
-    """).fetchone()[0]
+# Compared tactic pairs, in report order. Comparisons excluding trivial declarations
+# are skipped when no useAesop results were collected.
+COMPARISONS = [
+    {'analysis_name': 'aesop', 'old_tactic': 'useAesopPUnsafeOld', 'new_tactic': 'useAesopPUnsafeNew', 'success_only': False},
+    {'analysis_name': 'aesop', 'old_tactic': 'useAesopPUnsafeOld', 'new_tactic': 'useAesopPUnsafeNew', 'success_only': True},
+    {'analysis_name': 'aesop', 'old_tactic': 'useAesopPUnsafeOld', 'new_tactic': 'useAesopPUnsafeNew', 'success_only': False, 'exclude_trivial': True},
+    {'analysis_name': 'aesop', 'old_tactic': 'useAesopPUnsafeOld', 'new_tactic': 'useAesopPUnsafeNew', 'success_only': True, 'exclude_trivial': True},
+    {'analysis_name': 'saturate', 'old_tactic': 'useSaturateOldDAs', 'new_tactic': 'useSaturateNewDAss', 'success_only': False},
+    {'analysis_name': 'saturate', 'old_tactic': 'useSaturateOldDAs', 'new_tactic': 'useSaturateNewDAss', 'success_only': True},
+]
 
-    gathered_inconsistent_timeout = con.execute(f"""
-        SELECT COUNT(*)
-        FROM (
-            SELECT declaration
-            FROM gathered_raw
-            WHERE tactic = '{tactic}'
-            GROUP BY declaration
-            HAVING min(time) <= 11e3 AND max(time) > 11e3
-        )
-    """).fetchone()[0]
+# Columns of the comparison frame summarized by `report_comparison_metrics`, and their quantiles
+COMPARISON_METRICS = ['old_total', 'new_total', 'old_time', 'new_time', 'new_max_instantiations', 'old_max_depth', 'old_max_lctx_size']
+COMPARISON_QUANTILES = [0.01, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99]
 
-    gathered_inconsistent_variance = con.execute(f"""
-        SELECT COUNT(*)
-        FROM (
-            SELECT declaration
-            FROM gathered_raw
-            WHERE tactic = '{tactic}'
-            GROUP BY declaration
-            HAVING max(time)::DOUBLE / min(time) > {HIGH_VARIANCE_THRESHOLD}
-                AND NOT (min(success) != max(success))
-                AND NOT (min(time) <= 11e3 AND max(time) > 11e3)
-        )
-    """).fetchone()[0]
-
-    print(f"\n{tactic}:")
-    print(f"  Aesop: {raw_aesop} raw → {agg_aesop} aggregated ({raw_aesop - agg_aesop} excluded, {(raw_aesop - agg_aesop) / raw_aesop * 100:.2f}%)")
-    if raw_aesop - agg_aesop > 0:
-        print(f"    Inconsistent success: {aesop_inconsistent_success} ({aesop_inconsistent_success / raw_aesop * 100:.2f}%)")
-        print(f"    Inconsistent timeout: {aesop_inconsistent_timeout} ({aesop_inconsistent_timeout / raw_aesop * 100:.2f}%)")
-        print(f"    High variance (>{HIGH_VARIANCE_THRESHOLD}x): {aesop_inconsistent_variance} ({aesop_inconsistent_variance / raw_aesop * 100:.2f}%)")
-    print(f"  Gathered: {raw_gathered} raw → {agg_gathered} aggregated ({raw_gathered - agg_gathered} excluded, {(raw_gathered - agg_gathered) / raw_gathered * 100:.2f}%)")
-    if raw_gathered - agg_gathered > 0:
-        print(f"    Inconsistent success: {gathered_inconsistent_success} ({gathered_inconsistent_success / raw_gathered * 100:.2f}%)")
-        print(f"    Inconsistent timeout: {gathered_inconsistent_timeout} ({gathered_inconsistent_timeout / raw_gathered * 100:.2f}%)")
-        print(f"    High variance (>{HIGH_VARIANCE_THRESHOLD}x): {gathered_inconsistent_variance} ({gathered_inconsistent_variance / raw_gathered * 100:.2f}%)")
-
-print("\n" + "="*80)
-print("SANITY CHECKS")
-print("="*80)
-
-# Sanity Check: Coverage of successful tactic calls
-print("\nCoverage of successful tactic calls in aesopstats.parquet:")
-tactics_of_interest = ['useAesopPUnsafeOld', 'useAesopPUnsafeNew', 'useSaturateNewDAss', 'useSaturateOldDAs']
+# Phase timers recorded by Aesop, in ns
+PHASES = ['configParsing', 'ruleSetConstruction', 'ruleSelection', 'forwardState', 'search', 'script']
 
-for tactic in tactics_of_interest:
-    result = con.execute(f"""
-        SELECT
-            COUNT(*) as num_successful,
-            SUM(CASE WHEN declaration IN (SELECT declaration FROM aesop_{tactic}) THEN 1 ELSE 0 END) as num_in_aesop
-        FROM gathered_{tactic}
-        WHERE success = true
-    """).fetchone()
-    assert result is not None
-    num_successful, num_in_aesop = result
-    print(f"  {tactic}: {num_in_aesop / num_successful * 100:.2f}% ({num_in_aesop}/{num_successful})")
-
-def print_avg_time_diff_ns(tactic: str, successful_only: bool):
-    result = con.execute(f"""
-        SELECT
-            AVG(g.time) AS avg_gathered_time,
-            AVG(a.total) AS avg_aesop_time
-        FROM gathered_{tactic} g
-        JOIN aesop_{tactic} a ON g.declaration = a.declaration
-        WHERE g.time <= 11000 AND a.total <= 11e9
-            {"AND g.success" if successful_only else ""}
-    """).fetchone()
-    assert result is not None
-    avg_gathered_time, avg_aesop_time = result
-    avg_gathered_time = avg_gathered_time*1e6 # times in gathered are in ms; aesopstats in ns
-    abs_diff = avg_gathered_time - avg_aesop_time
-    rel_diff = abs_diff / avg_gathered_time
-    print(f"  {tactic} (no timeout{" and successful only" if successful_only else ""}):")
-    print(f"    Avg gathered time: {avg_gathered_time/1e6:.2f}ms")
-    print(f"    Avg aesopstats time: {avg_aesop_time/1e6:.2f}ms")
-    print(f"    Avg difference: {abs_diff/1e6:.2f}ms ({rel_diff * 100:.2f}%)")
-
-# Sanity Check: Total time comparison
-print("\nRecorded total time (gatheredresult - aesopstats):")
-for tactic in tactics_of_interest:
-    print_avg_time_diff_ns(tactic, successful_only=False)
-    print_avg_time_diff_ns(tactic, successful_only=True)
-
-# Sanity Check: Time sanity check for samples in aesopstats.parquet
-print("\nTimeout prevalence:")
-for tactic in tactics_of_interest:
-    result = con.execute(f"""
-        SELECT
-            SUM(CASE WHEN g.time >= 11e3 THEN 1 ELSE 0 END) as over_threshold_gathered,
-            SUM(CASE WHEN a.total >= 11e9 THEN 1 ELSE 0 END) as over_threshold_aesop,
-            COUNT(*) as total
-        FROM gathered_{tactic} g
-        JOIN aesop_{tactic} a ON g.declaration = a.declaration
-    """).fetchone()
-    assert result is not None
-    over_threshold_gathered, over_threshold_aesop, total = result
-    print(f"  {tactic}:")
-    print(f"    {over_threshold_gathered}/{total} samples with gathered time >= 11s ({over_threshold_gathered/total*100:.2f}%)")
-    print(f"    {over_threshold_aesop}/{total} samples with Aesop time >= 11s ({over_threshold_aesop/total*100:.2f}%)")
-
-def select_decls(*,
-        old_tactic: str,
-        new_tactic: str,
-        success_match: bool,
-        success_both: bool,
-        timeout: bool,
-        exclude_trivial: bool = False) -> str:
-    query = f"""
-        SELECT o.declaration
-        FROM gathered_{old_tactic} o
-        JOIN gathered_{new_tactic} n ON o.declaration = n.declaration
-        JOIN aesop_{old_tactic} ao ON o.declaration = ao.declaration
-        JOIN aesop_{new_tactic} an ON n.declaration = an.declaration
-    """
+def print_header(title: str) -> None:
+    print("\n" + "="*80)
+    print(title)
+    print("="*80)
 
-    conditions = []
-    if success_match:
-        conditions.append("o.success = n.success")
-    if success_both:
-        conditions.append("o.success AND n.success")
-    if timeout:
-        conditions.append("o.time <= 11e3 AND n.time <= 11e3")
-        conditions.append("ao.total <= 11e9 AND an.total <= 11e9")
+def comparison_filter(*, success_only: bool, exclude_trivial: bool) -> str:
+    """Condition on a comparison frame (see `Analysis.comparison_frame`) selecting the compared declarations."""
+    conditions = ["within_timeout", "success_match"]
+    if success_only:
+        conditions.append("success_both")
     if exclude_trivial:
-        conditions.append("o.declaration NOT IN (SELECT declaration FROM gathered_useAesop WHERE success = true)")
+        conditions.append("NOT trivial")
+    return " AND ".join(conditions)
+
+def quantile_summary(stats: dict) -> dict:
+    """A `{min, avg, max, q}` struct of `report_comparison_metrics` keyed as `min`, `p1`, ..., `avg`, `max`."""
+    qs = stats['q'] if stats['q'] is not None else [None] * len(COMPARISON_QUANTILES)
+    return {'min': stats['min'], 'avg': stats['avg'], 'max': stats['max'],
+            **{f"p{round(q * 100)}": v for q, v in zip(COMPARISON_QUANTILES, qs)}}
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
+def fetch_columns(result: duckdb.DuckDBPyConnection | duckdb.DuckDBPyRelation) -> dict[str, np.ndarray]:
+    """Fetch a query result as NumPy columns through Arrow.
 
-    return query
+    Numeric columns without NULLs are zero-copy views of the Arrow buffers; NULLs become NaN.
+    """
+    table = result.fetch_arrow_table()
+    return {name: table.column(name).to_numpy() for name in table.column_names}
 
-def count_select(select: str) -> int:
-    result = con.execute(f"SELECT COUNT(*) FROM ({select})").fetchone()
-    assert result is not None
-    return result[0]
+def group_mean(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct `keys` (sorted) and the mean of `values` for each, ignoring NaN keys and values."""
+    valid = ~np.isnan(keys) & ~np.isnan(values)
+    groups, inverse = np.unique(keys[valid], return_inverse=True)
+    return groups, np.bincount(inverse, weights=values[valid]) / np.bincount(inverse)
 
-def export_samples(df, filename: Path) -> None:
+def export_samples(samples: dict[str, np.ndarray], filename: Path) -> None:
     with open(filename, 'w') as f:
-        for _, row in df.iterrows():
-            f.write(f"file:     {row['file']}\n")
-            f.write(f"name:     {row['declaration']}\n")
-            f.write(f"syntax:   {row['syntax']}\n")
-            f.write(f"old_time: {row['old_time_ms']:.2f} ms\n")
-            f.write(f"new_time: {row['new_time_ms']:.2f} ms\n")
-            f.write(f"slowdown: {row['slowdown']:.2f}x\n")
+        for decl, file, syntax, old_time_ms, new_time_ms, slowdown in zip(
+                samples['declaration'], samples['file'], samples['syntax'],
+                samples['old_time_ms'], samples['new_time_ms'], samples['slowdown']):
+            f.write(f"file:     {file}\n")
+            f.write(f"name:     {decl}\n")
+            f.write(f"syntax:   {syntax}\n")
+            f.write(f"old_time: {old_time_ms:.2f} ms\n")
+            f.write(f"new_time: {new_time_ms:.2f} ms\n")
+            f.write(f"slowdown: {slowdown:.2f}x\n")
             f.write("\n")
 
-def compare_tactics(*, old_tactic: str, new_tactic: str, analysis_name: str, success_only=False, exclude_trivial=False) -> None:
-    """Compare two tactics, optionally filtering for successful samples only."""
+class Analysis:
+    """Views over the collected Parquet files in `input_dir`, and the report steps built on them.
 
-    print("\n" + "="*80)
-    print(f"Analysis {analysis_name}{" (only successful)" if success_only else ""}{" (excluding trivial)" if exclude_trivial else ""}")
-    print("="*80)
+    Plots and sample exports are written below `output_dir` (defaults to `input_dir`).
+    """
 
-    plot_suffix = "_success_only" if success_only else "_all"
-    if exclude_trivial:
-        plot_suffix += "_nontrivial"
-
-    # Create table with declarations included in analysis
-    decls = f"{analysis_name}_decls"
-    con.execute(f"""
-        CREATE TEMP TABLE {decls} AS
-        {select_decls(old_tactic=old_tactic, new_tactic=new_tactic,
-          success_match=True,
-          timeout=True,
-          success_both=success_only,
-          exclude_trivial=exclude_trivial,
-          )}
-    """)
-    con.execute(f"CREATE UNIQUE INDEX {decls}_idx ON {decls} (declaration)")
-    num_decls = count_select(f"SELECT * FROM {decls}")
-
-    # Exclusion analysis
-    num_base_decls = count_select(select_decls(
-        old_tactic=old_tactic, new_tactic=new_tactic,
-        timeout=False,
-        success_match=False,
-        success_both=False,
-        exclude_trivial=False,
-        ))
-
-    num_decls_aesop_timeout = count_select(select_decls(
-        old_tactic=old_tactic, new_tactic=new_tactic,
-        timeout=True,
-        success_match=False,
-        success_both=False,
-        exclude_trivial=False,
-        ))
-    num_excluded_timeout = num_base_decls - num_decls_aesop_timeout
-
-    num_decls_aesop_timeout_success_match = count_select(select_decls(
-        old_tactic=old_tactic, new_tactic=new_tactic,
-        timeout=True,
-        success_match=True,
-        success_both=False,
-        exclude_trivial=False,
-        ))
-    num_excluded_success_match = num_decls_aesop_timeout - num_decls_aesop_timeout_success_match
-
-    num_excluded_success_both = 0
-    if success_only:
-        num_decls_aesop_timeout_success_both = count_select(select_decls(
-            old_tactic=old_tactic, new_tactic=new_tactic,
-            timeout=True,
-            success_match=True,
-            success_both=True,
-            exclude_trivial=False,
-            ))
-        num_excluded_success_both = num_decls_aesop_timeout_success_match - num_decls_aesop_timeout_success_both
-
-    num_excluded_trivial = 0
-    if exclude_trivial:
-        num_decls_before_trivial_filter = count_select(select_decls(
-            old_tactic=old_tactic, new_tactic=new_tactic,
-            timeout=True,
-            success_match=True,
-            success_both=success_only,
-            exclude_trivial=False,
-            ))
-        num_excluded_trivial = num_decls_before_trivial_filter - num_decls
-
-    print(f"\nTotal declarations with both old and new results: {num_base_decls}")
-    print(f"Excluded (any time > 11s): {num_excluded_timeout} ({num_excluded_timeout/num_base_decls*100:.2f}%)")
-    print(f"Excluded (different success status): {num_excluded_success_match} ({num_excluded_success_match/num_base_decls*100:.2f}%)")
-    print(f"Excluded (not both successful): {num_excluded_success_both} ({num_excluded_success_both/num_base_decls*100:.2f}%)")
-    if exclude_trivial:
-        print(f"Excluded (trivial): {num_excluded_trivial} ({num_excluded_trivial/num_base_decls*100:.2f}%)")
-    print(f"Included in analysis: {num_decls} ({num_decls/num_base_decls*100:.2f}%)")
-
-    # Problems solved by each variant
-    old_solved = con.execute(f"SELECT COUNT(*) FROM gathered_{old_tactic} WHERE success = true").fetchone()[0]
-    new_solved = con.execute(f"SELECT COUNT(*) FROM gathered_{new_tactic} WHERE success = true").fetchone()[0]
-    print(f"\nProblems solved: naive={old_solved}, incremental={new_solved}")
-
-    # Create views with filtered declarations
-    old = f"{analysis_name}_old"
-    con.execute(f"""
-        CREATE OR REPLACE TEMP VIEW {old} AS
-        SELECT *
-        FROM aesop_{old_tactic}
-        WHERE declaration IN (SELECT declaration FROM {decls})
-    """)
-
-    new = f"{analysis_name}_new"
-    con.execute(f"""
-        CREATE OR REPLACE TEMP VIEW {new} AS
-        SELECT *
-        FROM aesop_{new_tactic}
-        WHERE declaration IN (SELECT declaration FROM {decls})
-    """)
-
-    # Metrics
-    print("\nTotal time (aesopstats):")
-    result = con.execute(f"""
-        SELECT
-            AVG(o.total) as avg_old,
-            AVG(n.total) as avg_new,
-            MIN(o.total) as min_old,
-            MIN(n.total) as min_new,
-            percentile_cont(0.01) WITHIN GROUP (ORDER BY o.total) as p01_old,
-            percentile_cont(0.01) WITHIN GROUP (ORDER BY n.total) as p01_new,
-            percentile_cont(0.10) WITHIN GROUP (ORDER BY o.total) as p10_old,
-            percentile_cont(0.10) WITHIN GROUP (ORDER BY n.total) as p10_new,
-            percentile_cont(0.25) WITHIN GROUP (ORDER BY o.total) as p25_old,
-            percentile_cont(0.25) WITHIN GROUP (ORDER BY n.total) as p25_new,
-            percentile_cont(0.50) WITHIN GROUP (ORDER BY o.total) as p50_old,
-            percentile_cont(0.50) WITHIN GROUP (ORDER BY n.total) as p50_new,
-            percentile_cont(0.75) WITHIN GROUP (ORDER BY o.total) as p75_old,
-            percentile_cont(0.75) WITHIN GROUP (ORDER BY n.total) as p75_new,
-            percentile_cont(0.90) WITHIN GROUP (ORDER BY o.total) as p90_old,
-            percentile_cont(0.90) WITHIN GROUP (ORDER BY n.total) as p90_new,
-            percentile_cont(0.99) WITHIN GROUP (ORDER BY o.total) as p99_old,
-            percentile_cont(0.99) WITHIN GROUP (ORDER BY n.total) as p99_new,
-            MAX(o.total) as max_old,
-            MAX(n.total) as max_new
-        FROM {old} o
-        JOIN {new} n ON o.declaration = n.declaration
-    """).fetchone()
-    assert result is not None
-    (avg_old, avg_new, min_old, min_new, p01_old, p01_new, p10_old, p10_new, p25_old, p25_new, p50_old, p50_new, p75_old, p75_new, p90_old, p90_new, p99_old, p99_new, max_old, max_new) = result
-    print(f"  Old: min={min_old/1e6:.2f}ms, p1={p01_old/1e6:.2f}ms, p10={p10_old/1e6:.2f}ms, p25={p25_old/1e6:.2f}ms, p50={p50_old/1e6:.2f}ms, avg={avg_old/1e6:.2f}ms, p75={p75_old/1e6:.2f}ms, p90={p90_old/1e6:.2f}ms, p99={p99_old/1e6:.2f}ms, max={max_old/1e6:.2f}ms")
-    print(f"  New: min={min_new/1e6:.2f}ms, p1={p01_new/1e6:.2f}ms, p10={p10_new/1e6:.2f}ms, p25={p25_new/1e6:.2f}ms, p50={p50_new/1e6:.2f}ms, avg={avg_new/1e6:.2f}ms, p75={p75_new/1e6:.2f}ms, p90={p90_new/1e6:.2f}ms, p99={p99_new/1e6:.2f}ms, max={max_new/1e6:.2f}ms")
-    print(f"  Time difference (old - new): min={(min_old-min_new)/1e6:.2f}ms, p1={(p01_old-p01_new)/1e6:.2f}ms, p10={(p10_old-p10_new)/1e6:.2f}ms, p25={(p25_old-p25_new)/1e6:.2f}ms, p50={(p50_old-p50_new)/1e6:.2f}ms, avg={(avg_old-avg_new)/1e6:.2f}ms, p75={(p75_old-p75_new)/1e6:.2f}ms, p90={(p90_old-p90_new)/1e6:.2f}ms, p99={(p99_old-p99_new)/1e6:.2f}ms, max={(max_old-max_new)/1e6:.2f}ms")
-    print(f"  Speedup (old/new): min={min_old/min_new:.3f}x, p1={p01_old/p01_new:.3f}x, p10={p10_old/p10_new:.3f}x, p25={p25_old/p25_new:.3f}x, p50={p50_old/p50_new:.3f}x, avg={avg_old/avg_new:.3f}x, p75={p75_old/p75_new:.3f}x, p90={p90_old/p90_new:.3f}x, p99={p99_old/p99_new:.3f}x, max={max_old/max_new:.3f}x")
-
-    print("\nTotal time (gatheredresult):")
-    result = con.execute(f"""
-        SELECT
-            AVG(o.time) as avg_old,
-            AVG(n.time) as avg_new,
-            MIN(o.time) as min_old,
-            MIN(n.time) as min_new,
-            percentile_cont(0.01) WITHIN GROUP (ORDER BY o.time) as p01_old,
-            percentile_cont(0.01) WITHIN GROUP (ORDER BY n.time) as p01_new,
-            percentile_cont(0.10) WITHIN GROUP (ORDER BY o.time) as p10_old,
-            percentile_cont(0.10) WITHIN GROUP (ORDER BY n.time) as p10_new,
-            percentile_cont(0.25) WITHIN GROUP (ORDER BY o.time) as p25_old,
-            percentile_cont(0.25) WITHIN GROUP (ORDER BY n.time) as p25_new,
-            percentile_cont(0.50) WITHIN GROUP (ORDER BY o.time) as p50_old,
-            percentile_cont(0.50) WITHIN GROUP (ORDER BY n.time) as p50_new,
-            percentile_cont(0.75) WITHIN GROUP (ORDER BY o.time) as p75_old,
-            percentile_cont(0.75) WITHIN GROUP (ORDER BY n.time) as p75_new,
-            percentile_cont(0.90) WITHIN GROUP (ORDER BY o.time) as p90_old,
-            percentile_cont(0.90) WITHIN GROUP (ORDER BY n.time) as p90_new,
-            percentile_cont(0.99) WITHIN GROUP (ORDER BY o.time) as p99_old,
-            percentile_cont(0.99) WITHIN GROUP (ORDER BY n.time) as p99_new,
-            MAX(o.time) as max_old,
-            MAX(n.time) as max_new
-        FROM gathered_{old_tactic} o
-        JOIN gathered_{new_tactic} n ON o.declaration = n.declaration
-        WHERE o.declaration IN (SELECT declaration FROM {decls})
-    """).fetchone()
-    assert result is not None
-    (avg_old_g, avg_new_g, min_old_g, min_new_g, p01_old_g, p01_new_g, p10_old_g, p10_new_g, p25_old_g, p25_new_g, p50_old_g, p50_new_g, p75_old_g, p75_new_g, p90_old_g, p90_new_g, p99_old_g, p99_new_g, max_old_g, max_new_g) = result
-    print(f"  Old: min={min_old_g:.2f}ms, p1={p01_old_g:.2f}ms, p10={p10_old_g:.2f}ms, p25={p25_old_g:.2f}ms, p50={p50_old_g:.2f}ms, avg={avg_old_g:.2f}ms, p75={p75_old_g:.2f}ms, p90={p90_old_g:.2f}ms, p99={p99_old_g:.2f}ms, max={max_old_g:.2f}ms")
-    print(f"  New: min={min_new_g:.2f}ms, p1={p01_new_g:.2f}ms, p10={p10_new_g:.2f}ms, p25={p25_new_g:.2f}ms, p50={p50_new_g:.2f}ms, avg={avg_new_g:.2f}ms, p75={p75_new_g:.2f}ms, p90={p90_new_g:.2f}ms, p99={p99_new_g:.2f}ms, max={max_new_g:.2f}ms")
-    print(f"  Time difference (old - new): min={(min_old_g-min_new_g):.2f}ms, p1={(p01_old_g-p01_new_g):.2f}ms, p10={(p10_old_g-p10_new_g):.2f}ms, p25={(p25_old_g-p25_new_g):.2f}ms, p50={(p50_old_g-p50_new_g):.2f}ms, avg={(avg_old_g-avg_new_g):.2f}ms, p75={(p75_old_g-p75_new_g):.2f}ms, p90={(p90_old_g-p90_new_g):.2f}ms, p99={(p99_old_g-p99_new_g):.2f}ms, max={(max_old_g-max_new_g):.2f}ms")
-    print(f"  Speedup (old/new): min={min_old_g/min_new_g:.3f}x, p1={p01_old_g/p01_new_g:.3f}x, p10={p10_old_g/p10_new_g:.3f}x, p25={p25_old_g/p25_new_g:.3f}x, p50={p50_old_g/p50_new_g:.3f}x, avg={avg_old_g/avg_new_g:.3f}x, p75={p75_old_g/p75_new_g:.3f}x, p90={p90_old_g/p90_new_g:.3f}x, p99={p99_old_g/p99_new_g:.3f}x, max={max_old_g/max_new_g:.3f}x")
-
-    print("\nMax instantiations per sample (new):")
-    result = con.execute(f"""
-        SELECT
-            MIN(n.max_instantiations) as new_min,
-            percentile_cont(0.25) WITHIN GROUP (ORDER BY n.max_instantiations) as new_p25,
-            percentile_cont(0.50) WITHIN GROUP (ORDER BY n.max_instantiations) as new_p50,
-            percentile_cont(0.75) WITHIN GROUP (ORDER BY n.max_instantiations) as new_p75,
-            percentile_cont(0.90) WITHIN GROUP (ORDER BY n.max_instantiations) as new_p90,
-            percentile_cont(0.95) WITHIN GROUP (ORDER BY n.max_instantiations) as new_p95,
-            percentile_cont(0.99) WITHIN GROUP (ORDER BY n.max_instantiations) as new_p99,
-            MAX(n.max_instantiations) as new_max,
-            AVG(n.max_instantiations) as new_avg
-        FROM {new} n
-    """).fetchone()
-    assert result is not None
-    new_min, new_p25, new_p50, new_p75, new_p90, new_p95, new_p99, new_max, new_avg = result
-    def fmt(v): return f"{v:.0f}" if v is not None else "N/A"
-    print(f"  min={new_min or 0}, p25={fmt(new_p25)}, p50={fmt(new_p50)}, p75={fmt(new_p75)}, p90={fmt(new_p90)}, p95={fmt(new_p95)}, p99={fmt(new_p99)}, max={new_max or 0}, avg={fmt(new_avg)}")
-
-    if old_tactic in aesop_tactics:
-        print("\nMaximum depth per sample (old):")
-        result = con.execute(f"""
+    def __init__(self, input_dir: Path, output_dir: Path | None = None, con: duckdb.DuckDBPyConnection | None = None):
+        self.input_dir = input_dir
+        self.output_dir = output_dir if output_dir is not None else input_dir
+        self.con = con if con is not None else duckdb.connect()
+        self._tactic_tables: set[str] = set()
+        self._pair_tables: set[str] = set()
+        self._create_views()
+
+    def _create_views(self) -> None:
+        con = self.con
+        # Either single files or datasets partitioned by tactic, see parquet_layout.py
+        con.execute(f"CREATE VIEW aesop_raw AS SELECT * FROM {parquet_layout.source(self.input_dir, 'aesopstats')}")
+        con.execute(f"CREATE VIEW gathered_raw AS SELECT * FROM {parquet_layout.source(self.input_dir, 'gatheredresult')}")
+
+        # Aggregate aesop: pick run with median total time, filter inconsistent success/timeout
+        con.execute(f"""
+            CREATE VIEW aesop AS
+            WITH ranked AS (
+                SELECT *,
+                    ROW_NUMBER() OVER (PARTITION BY tactic, declaration ORDER BY total) as rn,
+                    COUNT(*) OVER w as cnt,
+                    min(goalSolved) OVER w as min_solved,
+                    max(goalSolved) OVER w as max_solved,
+                    min(total) OVER w as min_total,
+                    max(total) OVER w as max_total
+                FROM aesop_raw
+                WINDOW w AS (PARTITION BY tactic, declaration)
+            )
             SELECT
-                MIN(o.max_depth) as min_old,
-                percentile_cont(0.01) WITHIN GROUP (ORDER BY o.max_depth) as p01_old,
-                percentile_cont(0.10) WITHIN GROUP (ORDER BY o.max_depth) as p10_old,
-                percentile_cont(0.25) WITHIN GROUP (ORDER BY o.max_depth) as p25_old,
-                percentile_cont(0.50) WITHIN GROUP (ORDER BY o.max_depth) as p50_old,
-                percentile_cont(0.75) WITHIN GROUP (ORDER BY o.max_depth) as p75_old,
-                percentile_cont(0.90) WITHIN GROUP (ORDER BY o.max_depth) as p90_old,
-                percentile_cont(0.99) WITHIN GROUP (ORDER BY o.max_depth) as p99_old,
-                MAX(o.max_depth) as max_old,
-                AVG(o.max_depth) as avg_old
-            FROM {old} o
+                tactic, declaration, total, search, script, ruleSetConstruction,
+                ruleSelection, forwardState, configParsing,
+                syntax, file, goalSolved, ruleStats, goalStats
+            FROM ranked
+            WHERE rn = (cnt + 1) / 2
+                -- Consistency over the runs, as window aggregates so that a tactic
+                -- predicate on the view still prunes `aesop_raw` in a single scan
+                AND min_solved = max_solved
+                AND NOT (min_total <= 11e9 AND max_total > 11e9)
+                AND max_total::DOUBLE / min_total <= {HIGH_VARIANCE_THRESHOLD}
+        """)
+
+        # Aggregate gathered: median time, filter inconsistent success/timeout
+        con.execute(f"""
+            CREATE VIEW gathered AS
+            SELECT
+                tactic,
+                declaration,
+                first(success) as success,
+                CAST(percentile_cont(0.5) WITHIN GROUP (ORDER BY time) AS INTEGER) as time
+            FROM gathered_raw
+            GROUP BY tactic, declaration
+            HAVING min(success) = max(success)
+                AND NOT (min(time) <= 11e3 AND max(time) > 11e3)
+                AND max(time)::DOUBLE / min(time) <= {HIGH_VARIANCE_THRESHOLD}
+        """)
+
+        # Aggregate gathered without consistency filters: majority success, median time of the
+        # repetitions with the majority outcome (a solved declaration keeps a solving time)
+        con.execute("""
+            CREATE VIEW gathered_unfiltered AS
+            WITH voted AS (
+                SELECT *,
+                    avg(success::INTEGER) OVER (PARTITION BY tactic, declaration) > 0.5 as majority
+                FROM gathered_raw
+            )
+            SELECT
+                tactic,
+                declaration,
+                majority as success,
+                median(time) FILTER (WHERE success = majority) as time
+            FROM voted
+            GROUP BY tactic, declaration, majority
+        """)
+
+        if self.has_logs:
+            con.execute(f"CREATE VIEW log_raw AS SELECT * FROM '{self.input_dir / 'logresults.parquet'}'")
+            con.execute(f"CREATE VIEW log_messages AS SELECT * FROM '{self.input_dir / 'logmessages.parquet'}'")
+
+    # Relations
+
+    @property
+    def aesop_raw(self) -> duckdb.DuckDBPyRelation:
+        return self.con.view('aesop_raw')
+
+    @property
+    def gathered_raw(self) -> duckdb.DuckDBPyRelation:
+        return self.con.view('gathered_raw')
+
+    @property
+    def aesop(self) -> duckdb.DuckDBPyRelation:
+        """Median run per (tactic, declaration), excluding inconsistent or high-variance repetitions."""
+        return self.con.view('aesop')
+
+    @property
+    def gathered(self) -> duckdb.DuckDBPyRelation:
+        """Median time per (tactic, declaration), excluding inconsistent or high-variance repetitions."""
+        return self.con.view('gathered')
+
+    @property
+    def gathered_unfiltered(self) -> duckdb.DuckDBPyRelation:
+        return self.con.view('gathered_unfiltered')
+
+    @property
+    def has_logs(self) -> bool:
+        return (self.input_dir / 'logresults.parquet').exists()
+
+    def tactic_gathered(self, tactic: str) -> duckdb.DuckDBPyRelation:
+        self.materialize_tactics([tactic])
+        return self.con.table(f'gathered_{tactic}')
+
+    def tactic_aesop(self, tactic: str) -> duckdb.DuckDBPyRelation:
+        """Aggregated Aesop stats of `tactic` with per-sample forward reasoning features."""
+        self.materialize_tactics([tactic])
+        return self.con.table(f'aesop_{tactic}')
+
+    def comparison_frame(self, *, old_tactic: str, new_tactic: str) -> str:
+        """Create the temp table `pair_{old_tactic}_{new_tactic}` if not done yet and return its name.
+
+        One row per declaration with gathered and Aesop results for both tactics: the columns
+        in `COMPARISON_METRICS` plus the flags used by `comparison_filter`.
+        """
+        frame = f"pair_{old_tactic}_{new_tactic}"
+        if frame in self._pair_tables:
+            return frame
+        self.materialize_tactics([old_tactic, new_tactic, 'useAesop'])
+        self.con.execute(f"""
+            CREATE TEMP TABLE {frame} AS
+            SELECT
+                o.declaration,
+                o.time as old_time,
+                n.time as new_time,
+                ao.total as old_total,
+                an.total as new_total,
+                an.max_instantiations as new_max_instantiations,
+                ao.max_depth as old_max_depth,
+                ao.max_lctx_size as old_max_lctx_size,
+                o.time <= {TIMEOUT_MS} AND n.time <= {TIMEOUT_MS}
+                    AND ao.total <= {TIMEOUT_MS * 1e6} AND an.total <= {TIMEOUT_MS * 1e6} as within_timeout,
+                o.success = n.success as success_match,
+                o.success AND n.success as success_both,
+                o.declaration IN (SELECT declaration FROM gathered_useAesop WHERE success = true) as trivial
+            FROM gathered_{old_tactic} o
+            JOIN gathered_{new_tactic} n ON o.declaration = n.declaration
+            JOIN aesop_{old_tactic} ao ON o.declaration = ao.declaration
+            JOIN aesop_{new_tactic} an ON n.declaration = an.declaration
+        """)
+        self._pair_tables.add(frame)
+        return frame
+
+    def comparison_decls(self, *, old_tactic: str, new_tactic: str, success_only=False, exclude_trivial=False) -> duckdb.DuckDBPyRelation:
+        """Declarations included when comparing `old_tactic` with `new_tactic`."""
+        frame = self.comparison_frame(old_tactic=old_tactic, new_tactic=new_tactic)
+        return self.con.sql(f"""
+            SELECT declaration FROM {frame}
+            WHERE {comparison_filter(success_only=success_only, exclude_trivial=exclude_trivial)}
+        """)
+
+    @property
+    def plots_dir(self) -> Path:
+        path = self.output_dir / 'plots'
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @property
+    def samples_dir(self) -> Path:
+        path = self.output_dir / 'samples'
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def materialize_tactics(self, tactics: list[str]) -> None:
+        """Create the per-tactic tables `gathered_{tactic}` and `aesop_{tactic}` if not done yet."""
+        for tactic in tactics:
+            if tactic in self._tactic_tables:
+                continue
+            self.con.execute(f"CREATE TEMP TABLE gathered_{tactic} AS SELECT * FROM gathered WHERE tactic = '{tactic}'")
+            self.con.execute(f"""
+                CREATE TEMP TABLE aesop_{tactic} AS
+                SELECT
+                    declaration,
+                    total,
+                    file,
+                    syntax,
+                    goalSolved,
+                    ruleStats,
+                    goalStats,
+                    {', '.join(PHASES)},
+                    list_count(list_filter(ruleStats, r -> r.rule.builder = 'forward' AND r.successful)) as forward_success,
+                    list_count(list_filter(ruleStats, r -> r.rule.builder = 'forward')) as forward_total,
+                    list_max(list_transform(
+                        flatten(list_transform(
+                            flatten(list_transform(goalStats, g -> g.forwardStateStats.ruleStateStats)),
+                            r -> r.clusterStateStats
+                        )),
+                        c -> len(c.instantiationStats)
+                    )) as max_instantiations,
+                    list_max(list_transform(goalStats, g -> g.depth)) as max_depth,
+                    list_max(list_transform(goalStats, g -> g.lctxSize)) as max_lctx_size,
+                    list_max(list_transform(
+                        goalStats,
+                        g -> list_sum(list_transform(g.forwardStateStats.ruleStateStats, r -> len(r.clusterStateStats)))
+                    )) as max_clusters
+                FROM aesop
+                WHERE tactic = '{tactic}'
+            """)
+            self._tactic_tables.add(tactic)
+
+    # Report steps
+
+    def report_basic_stats(self) -> None:
+        gathered_stats = self.con.execute("""
+            SELECT
+                COUNT(*) as total_rows,
+                COUNT(DISTINCT declaration) as unique_decls
+            FROM gathered_raw
+        """).fetchone()
+        assert gathered_stats is not None
+        print(f"gatheredresult: {gathered_stats[0]} rows, {gathered_stats[1]} declarations")
+
+        aesop_stats = self.con.execute("""
+            SELECT
+                COUNT(*) as total_rows,
+                COUNT(DISTINCT declaration) as unique_decls
+            FROM aesop_raw
+        """).fetchone()
+        assert aesop_stats is not None
+        print(f"aesopstats:     {aesop_stats[0]} rows, {aesop_stats[1]} declarations")
+
+    def report_exclusions(self) -> None:
+        con = self.con
+        self.materialize_tactics(tactics)
+        print_header("INCONSISTENCY EXCLUSIONS")
+
+        for tactic in tactics:
+            # Count raw declarations
+            raw_aesop = con.execute(f"SELECT COUNT(DISTINCT declaration) FROM aesop_raw WHERE tactic = '{tactic}'").fetchone()[0]
+            raw_gathered = con.execute(f"SELECT COUNT(DISTINCT declaration) FROM gathered_raw WHERE tactic = '{tactic}'").fetchone()[0]
+
+            # Count after aggregation
+            agg_aesop = con.execute(f"SELECT COUNT(*) FROM aesop_{tactic}").fetchone()[0]
+            agg_gathered = con.execute(f"SELECT COUNT(*) FROM gathered_{tactic}").fetchone()[0]
+
+            # Aesop inconsistencies
+            aesop_inconsistent_success = con.execute(f"""
+                SELECT COUNT(*)
+                FROM (
+                    SELECT declaration
+                    FROM aesop_raw
+                    WHERE tactic = '{tactic}'
+                    GROUP BY declaration
+                    HAVING min(goalSolved) != max(goalSolved)
+                )
+            """).fetchone()[0]
+
+            aesop_inconsistent_timeout = con.execute(f"""
+                SELECT COUNT(*)
+                FROM (
+                    SELECT declaration
+                    FROM aesop_raw
+                    WHERE tactic = '{tactic}'
+                    GROUP BY declaration
+                    HAVING min(total) <= 11e9 AND max(total) > 11e9
+                )
+            """).fetchone()[0]
+
+            aesop_inconsistent_variance = con.execute(f"""
+                SELECT COUNT(*)
+                FROM (
+                    SELECT declaration
+                    FROM aesop_raw
+                    WHERE tactic = '{tactic}'
+                    GROUP BY declaration
+                    HAVING max(total)::DOUBLE / min(total) > {HIGH_VARIANCE_THRESHOLD}
+                        AND NOT (min(goalSolved) != max(goalSolved))
+                        AND NOT (min(total) <= 11e9 AND max(total) > 11e9)
+                )
+            """).fetchone()[0]
+
+            # Gathered inconsistencies
+            gathered_inconsistent_success = con.execute(f"""
+                SELECT COUNT(*)
+                FROM (
+                    SELECT declaration
+                    FROM gathered_raw
+                    WHERE tactic = '{tactic}'
+                    GROUP BY declaration
+                    HAVING min(success) != max(success)
+                )
+            """).fetchone()[0]
+
+            gathered_inconsistent_timeout = con.execute(f"""
+                SELECT COUNT(*)
+                FROM (
+                    SELECT declaration
+                    FROM gathered_raw
+                    WHERE tactic = '{tactic}'
+                    GROUP BY declaration
+                    HAVING min(time) <= 11e3 AND max(time) > 11e3
+                )
+            """).fetchone()[0]
+
+            gathered_inconsistent_variance = con.execute(f"""
+                SELECT COUNT(*)
+                FROM (
+                    SELECT declaration
+                    FROM gathered_raw
+                    WHERE tactic = '{tactic}'
+                    GROUP BY declaration
+                    HAVING max(time)::DOUBLE / min(time) > {HIGH_VARIANCE_THRESHOLD}
+                        AND NOT (min(success) != max(success))
+                        AND NOT (min(time) <= 11e3 AND max(time) > 11e3)
+                )
+            """).fetchone()[0]
+
+            print(f"\n{tactic}:")
+            print(f"  Aesop: {raw_aesop} raw → {agg_aesop} aggregated ({raw_aesop - agg_aesop} excluded, {(raw_aesop - agg_aesop) / raw_aesop * 100:.2f}%)")
+            if raw_aesop - agg_aesop > 0:
+                print(f"    Inconsistent success: {aesop_inconsistent_success} ({aesop_inconsistent_success / raw_aesop * 100:.2f}%)")
+                print(f"    Inconsistent timeout: {aesop_inconsistent_timeout} ({aesop_inconsistent_timeout / raw_aesop * 100:.2f}%)")
+                print(f"    High variance (>{HIGH_VARIANCE_THRESHOLD}x): {aesop_inconsistent_variance} ({aesop_inconsistent_variance / raw_aesop * 100:.2f}%)")
+            print(f"  Gathered: {raw_gathered} raw → {agg_gathered} aggregated ({raw_gathered - agg_gathered} excluded, {(raw_gathered - agg_gathered) / raw_gathered * 100:.2f}%)")
+            if raw_gathered - agg_gathered > 0:
+                print(f"    Inconsistent success: {gathered_inconsistent_success} ({gathered_inconsistent_success / raw_gathered * 100:.2f}%)")
+                print(f"    Inconsistent timeout: {gathered_inconsistent_timeout} ({gathered_inconsistent_timeout / raw_gathered * 100:.2f}%)")
+                print(f"    High variance (>{HIGH_VARIANCE_THRESHOLD}x): {gathered_inconsistent_variance} ({gathered_inconsistent_variance / raw_gathered * 100:.2f}%)")
+
+    def print_avg_time_diff_ns(self, tactic: str, successful_only: bool):
+        result = self.con.execute(f"""
+            SELECT
+                AVG(g.time) AS avg_gathered_time,
+                AVG(a.total) AS avg_aesop_time
+            FROM gathered_{tactic} g
+            JOIN aesop_{tactic} a ON g.declaration = a.declaration
+            WHERE g.time <= 11000 AND a.total <= 11e9
+                {"AND g.success" if successful_only else ""}
         """).fetchone()
         assert result is not None
-        (min_old_d, p01_old_d, p10_old_d, p25_old_d, p50_old_d, p75_old_d, p90_old_d, p99_old_d, max_old_d, avg_old_d) = result
-        print(f"  min={min_old_d}, p1={p01_old_d:.0f}, p10={p10_old_d:.0f}, p25={p25_old_d:.0f}, p50={p50_old_d:.0f}, avg={avg_old_d:.2f}, p75={p75_old_d:.0f}, p90={p90_old_d:.0f}, p99={p99_old_d:.0f}, max={max_old_d}")
+        avg_gathered_time, avg_aesop_time = result
+        avg_gathered_time = avg_gathered_time*1e6 # times in gathered are in ms; aesopstats in ns
+        abs_diff = avg_gathered_time - avg_aesop_time
+        rel_diff = abs_diff / avg_gathered_time
+        print(f"  {tactic} (no timeout{" and successful only" if successful_only else ""}):")
+        print(f"    Avg gathered time: {avg_gathered_time/1e6:.2f}ms")
+        print(f"    Avg aesopstats time: {avg_aesop_time/1e6:.2f}ms")
+        print(f"    Avg difference: {abs_diff/1e6:.2f}ms ({rel_diff * 100:.2f}%)")
+
+    def report_sanity_checks(self) -> None:
+        con = self.con
+        self.materialize_tactics(tactics_of_interest)
+        print_header("SANITY CHECKS")
+
+        # Sanity Check: Coverage of successful tactic calls
+        print("\nCoverage of successful tactic calls in aesopstats.parquet:")
+        for tactic in tactics_of_interest:
+            result = con.execute(f"""
+                SELECT
+                    COUNT(*) as num_successful,
+                    SUM(CASE WHEN declaration IN (SELECT declaration FROM aesop_{tactic}) THEN 1 ELSE 0 END) as num_in_aesop
+                FROM gathered_{tactic}
+                WHERE success = true
+            """).fetchone()
+            assert result is not None
+            num_successful, num_in_aesop = result
+            print(f"  {tactic}: {num_in_aesop / num_successful * 100:.2f}% ({num_in_aesop}/{num_successful})")
+
+        # Sanity Check: Total time comparison
+        print("\nRecorded total time (gatheredresult - aesopstats):")
+        for tactic in tactics_of_interest:
+            self.print_avg_time_diff_ns(tactic, successful_only=False)
+            self.print_avg_time_diff_ns(tactic, successful_only=True)
+
+        # Sanity Check: Time sanity check for samples in aesopstats.parquet
+        print("\nTimeout prevalence:")
+        for tactic in tactics_of_interest:
+            result = con.execute(f"""
+                SELECT
+                    SUM(CASE WHEN g.time >= 11e3 THEN 1 ELSE 0 END) as over_threshold_gathered,
+                    SUM(CASE WHEN a.total >= 11e9 THEN 1 ELSE 0 END) as over_threshold_aesop,
+                    COUNT(*) as total
+                FROM gathered_{tactic} g
+                JOIN aesop_{tactic} a ON g.declaration = a.declaration
+            """).fetchone()
+            assert result is not None
+            over_threshold_gathered, over_threshold_aesop, total = result
+            print(f"  {tactic}:")
+            print(f"    {over_threshold_gathered}/{total} samples with gathered time >= 11s ({over_threshold_gathered/total*100:.2f}%)")
+            print(f"    {over_threshold_aesop}/{total} samples with Aesop time >= 11s ({over_threshold_aesop/total*100:.2f}%)")
+
+    def censored_solver_stats(self, *, tactics: list[str], labels: list[str], plot_path: Path, decls: str | None = None) -> None:
+        """PAR scores and Kaplan-Meier solved curves with timeouts as right-censored observations.
+
+        Unlike the filtered metrics, this uses every (tactic, declaration) pair. Solved runs are events at
+        their median time, unsolved runs above TIMEOUT_MS are censored at their time, and other failures
+        never solve the problem.
+        """
+        tactic_list = ', '.join(f"'{t}'" for t in tactics)
+        obs = f"""
+            SELECT tactic, declaration, success, time,
+                CASE WHEN success OR time > {TIMEOUT_MS} THEN time ELSE 'infinity'::DOUBLE END as t
+            FROM gathered_unfiltered
+            WHERE tactic IN ({tactic_list})
+                {f"AND declaration IN ({decls})" if decls is not None else ""}
+        """
+        summary = self.con.execute(f"""
+            SELECT
+                tactic,
+                COUNT(*) as n,
+                COUNT(*) FILTER (WHERE success AND time <= {TIMEOUT_MS}) as solved,
+                COUNT(*) FILTER (WHERE NOT success AND time > {TIMEOUT_MS}) as timeouts,
+                COUNT(*) FILTER (WHERE NOT success AND time <= {TIMEOUT_MS}) as failed,
+                AVG(CASE WHEN success AND time <= {TIMEOUT_MS} THEN time ELSE 2 * {TIMEOUT_MS} END) as par2,
+                AVG(CASE WHEN success AND time <= {TIMEOUT_MS} THEN time ELSE 10 * {TIMEOUT_MS} END) as par10
+            FROM ({obs})
+            GROUP BY tactic
+        """).fetchdf().set_index('tactic')
+        km = self.con.execute(f"""
+            WITH steps AS (
+                SELECT tactic, t, SUM(success::INTEGER) as d, COUNT(*) as removed
+                FROM ({obs})
+                GROUP BY tactic, t
+            ),
+            at_risk AS (
+                SELECT tactic, t, d, SUM(removed) OVER (PARTITION BY tactic ORDER BY t DESC) as n
+                FROM steps
+            )
+            SELECT tactic, t, d, n FROM at_risk WHERE t < 'infinity'::DOUBLE ORDER BY tactic, t
+        """).fetchnumpy()
+
+        scope = "all declarations" if decls is None else "declarations with results for both tactics"
+        print(f"\nCensoring-aware statistics (cutoff {TIMEOUT_MS/1e3:.0f}s, timeouts right-censored, {scope}):")
+        with plt.rc_context(PLOT_RC):
+            plt.figure(figsize=(10, 6))
+            for tactic, label in zip(tactics, labels):
+                if tactic not in summary.index:
+                    continue
+                row = summary.loc[tactic]
+                mask = km['tactic'] == tactic
+                t, d, n = km['t'][mask], km['d'][mask], km['n'][mask]
+                survival = np.cumprod(1 - d / n)
+                # Restricted mean time to solve: area under the survival curve up to the cutoff
+                edges = np.concatenate([[0], np.clip(t, 0, TIMEOUT_MS), [TIMEOUT_MS]])
+                rmst = np.sum(np.concatenate([[1], survival]) * np.diff(edges))
+                before_cutoff = survival[t <= TIMEOUT_MS]
+                km_solved = 1 - (before_cutoff[-1] if len(before_cutoff) > 0 else 1)
+                name = tactic if label == tactic else f"{label} ({tactic})"
+                print(f"  {name}: n={row['n']:.0f}, solved={row['solved']:.0f}, timeouts={row['timeouts']:.0f}, failed={row['failed']:.0f}, "
+                      f"KM solved@cutoff={km_solved * 100:.2f}%, PAR-2={row['par2']:.2f}ms, PAR-10={row['par10']:.2f}ms, "
+                      f"restricted mean={rmst:.2f}ms")
+                plt.step(t, (1 - survival) * row['n'], where='post', label=label)
+            plt.axvline(x=TIMEOUT_MS, color='gray', linestyle='--', alpha=0.5)
+            plt.xscale('log')
+            plt.xlabel('Time (ms)')
+            plt.ylabel('Problems Solved (Kaplan-Meier)')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+            save_plot(plot_path)
+
+    def report_censored_stats(self) -> None:
+        print_header("CENSORING-AWARE SOLVER STATISTICS")
+        self.censored_solver_stats(
+            tactics=tactics,
+            labels=tactics,
+            plot_path=self.plots_dir / 'all_km_cumulative_solved',
+        )
+
+    def report_time_by_outcome(self, top_messages: int = 5) -> None:
+        """Break down harness time per tactic by outcome class from the module logs."""
+        if not self.has_logs:
+            return
+        print_header("TIME BY OUTCOME (module logs)")
+
+        totals = self.con.execute("""
+            SELECT
+                SUM(ms) as ms,
+                SUM(ms) FILTER (WHERE outcome = 'timeout') as timeout_ms,
+                SUM(ms) FILTER (WHERE outcome = 'heartbeats') as heartbeats_ms,
+                COUNT(*) FILTER (WHERE outcome = 'killed') as killed
+            FROM log_raw
+        """).fetchone()
+        assert totals is not None
+        total_ms, timeout_ms, heartbeats_ms, killed = (v or 0 for v in totals)
+        print(f"\nTotal tactic time: {total_ms/3.6e6:.2f}h")
+        print(f"  Timeouts: {timeout_ms/3.6e6:.2f}h ({timeout_ms/max(total_ms, 1)*100:.2f}%)")
+        print(f"  Heartbeat limits: {heartbeats_ms/3.6e6:.2f}h ({heartbeats_ms/max(total_ms, 1)*100:.2f}%)")
+        print(f"  Runs cut off by a killed module: {killed}")
+
+        by_outcome = self.con.execute("""
+            SELECT
+                tactic,
+                outcome,
+                COUNT(*) as runs,
+                coalesce(SUM(ms), 0) as ms,
+                coalesce(SUM(ms), 0)::DOUBLE / SUM(SUM(ms)) OVER (PARTITION BY tactic) as share,
+                coalesce(SUM(hb), 0) as hb
+            FROM log_raw
+            GROUP BY tactic, outcome
+            ORDER BY tactic, ms DESC
+        """).fetchall()
+        current = None
+        for tactic, outcome, runs, ms, share, hb in by_outcome:
+            if tactic != current:
+                print(f"\n{tactic}:")
+                current = tactic
+            print(f"  {outcome:<18} runs={runs:<8} time={ms/1e3:.1f}s ({(share or 0)*100:.2f}%), hb={hb}")
+
+        top = self.con.execute(f"""
+            WITH per_message AS (
+                SELECT tactic, message_hash, any_value(outcome) as outcome, COUNT(*) as runs, SUM(ms) as ms,
+                    ROW_NUMBER() OVER (PARTITION BY tactic ORDER BY SUM(ms) DESC) as rank
+                FROM log_raw
+                WHERE outcome NOT IN ('success', 'subgoals')
+                GROUP BY tactic, message_hash
+            )
+            SELECT p.tactic, p.outcome, p.runs, p.ms, m.message
+            FROM per_message p
+            LEFT JOIN log_messages m ON p.message_hash = m.message_hash
+            WHERE p.rank <= {top_messages}
+            ORDER BY p.tactic, p.rank
+        """).fetchall()
+        current = None
+        for tactic, outcome, runs, ms, message in top:
+            if tactic != current:
+                print(f"\nMost expensive failure messages ({tactic}):")
+                current = tactic
+            lines = (message or "").split("\n")
+            summary = lines[1] if lines[0] == "Result.exception ::" and len(lines) > 1 else lines[0]
+            print(f"  [{outcome}] runs={runs}, time={(ms or 0)/1e3:.1f}s: {summary[:160]}")
+
+    def analyze_rule_costs(self, *, old: str, new: str, rule_costs_file: Path, top_n: int = RULE_COSTS_TOP_N) -> None:
+        """Attribute rule time from ruleStats to individual rules, for old and new runs."""
+        print("\nRule costs (ruleStats):")
+        rules = self.con.execute(f"""
+            WITH apps AS (
+                SELECT variant, declaration,
+                    r.rule.name AS rule, r.rule.builder AS builder, r.elapsed AS elapsed, r.successful AS successful
+                FROM (
+                    SELECT 'old' AS variant, declaration, unnest(ruleStats) AS r FROM {old}
+                    UNION ALL
+                    SELECT 'new' AS variant, declaration, unnest(ruleStats) AS r FROM {new}
+                )
+            ),
+            per_decl AS (
+                SELECT variant, declaration, rule, builder,
+                    COUNT(*) AS apps,
+                    SUM(elapsed) AS time,
+                    SUM(successful::INTEGER) AS successes,
+                    SUM(elapsed) / SUM(SUM(elapsed)) OVER (PARTITION BY variant, declaration) AS share,
+                    ROW_NUMBER() OVER (PARTITION BY variant, declaration ORDER BY SUM(elapsed) DESC) AS rank
+                FROM apps
+                GROUP BY variant, declaration, rule, builder
+            )
+            SELECT
+                variant, rule, builder,
+                SUM(apps)::BIGINT AS apps,
+                COUNT(*) AS decls,
+                SUM(time) AS total_time,
+                SUM(time)::DOUBLE / SUM(apps) AS mean_time,
+                SUM(successes)::DOUBLE / SUM(apps) AS success_rate,
+                COUNT(*) FILTER (WHERE rank = 1) AS dominated,
+                coalesce(list(declaration ORDER BY share DESC) FILTER (WHERE rank = 1 AND share >= 0.5), []) AS dominated_decls
+            FROM per_decl
+            GROUP BY variant, rule, builder
+        """).fetchdf()
 
-        print("\nMaximum local context size per sample (old):")
-        result = con.execute(f"""
+        if len(rules) == 0:
+            print("  No rule statistics found")
+            return
+
+        def fmt_rule(row) -> str:
+            decls = row['dominated_decls']
+            examples = f", e.g. {', '.join(decls[:3])}" if len(decls) > 0 else ""
+            return (f"{row['rule']} [{row['builder']}]: total={row['total_time']/1e6:.2f}ms, "
+                    f"mean={row['mean_time']/1e6:.3f}ms, apps={row['apps']}, decls={row['decls']}, "
+                    f"success={row['success_rate']*100:.1f}%, dominant in {row['dominated']} decls "
+                    f"({len(decls)} with >=50% of rule time){examples}")
+
+        for variant, label in [('old', 'Naive'), ('new', 'Incremental')]:
+            top = rules[rules['variant'] == variant].nlargest(top_n, 'total_time')
+            print(f"  {label}: top {len(top)} rules by total time:")
+            for _, row in top.iterrows():
+                print(f"    {fmt_rule(row)}")
+
+        by_builder = rules.groupby(['builder', 'variant'])['total_time'].sum().unstack(fill_value=0)
+        print("  Total time by builder (old → new):")
+        for builder, row in by_builder.sort_values('old' if 'old' in by_builder else 'new', ascending=False).iterrows():
+            print(f"    {builder}: {row.get('old', 0)/1e6:.2f}ms → {row.get('new', 0)/1e6:.2f}ms")
+
+        # Rules whose total cost changed most between old and new forward reasoning
+        old_rules = rules[rules['variant'] == 'old'].set_index(['rule', 'builder'])
+        new_rules = rules[rules['variant'] == 'new'].set_index(['rule', 'builder'])
+        delta = (new_rules['total_time'].sub(old_rules['total_time'], fill_value=0)).rename('delta').to_frame()
+        delta['old'] = old_rules['total_time'].reindex(delta.index).fillna(0)
+        delta['new'] = new_rules['total_time'].reindex(delta.index).fillna(0)
+        for title, part in [('rose', delta.nlargest(top_n, 'delta')), ('fell', delta.nsmallest(top_n, 'delta'))]:
+            part = part[part['delta'] > 0] if title == 'rose' else part[part['delta'] < 0]
+            print(f"  Top {len(part)} rules whose cost {title} (new - old):")
+            for (rule, builder), row in part.iterrows():
+                print(f"    {rule} [{builder}]: {row['old']/1e6:.2f}ms → {row['new']/1e6:.2f}ms ({row['delta']/1e6:+.2f}ms)")
+
+        with open(rule_costs_file, 'w') as f:
+            for _, row in rules.sort_values(['variant', 'total_time'], ascending=[False, False]).iterrows():
+                f.write(f"{row['variant']}: {fmt_rule(row)}\n")
+        print(f"  Exported costs of {len(rules)} (variant, rule) pairs to {rule_costs_file}")
+
+    def model_speedup(self, *, old: str, new: str, bins: int = 5) -> None:
+        """Regress log-speedup on per-sample features of the incremental run and list regressing regions."""
+        print("\nSpeedup model (OLS of log(old/new) on log(1 + feature), HC3 standard errors):")
+        data = self.con.execute(f"""
             SELECT
-                MIN(o.max_lctx_size) as min_old,
-                percentile_cont(0.01) WITHIN GROUP (ORDER BY o.max_lctx_size) as p01_old,
-                percentile_cont(0.10) WITHIN GROUP (ORDER BY o.max_lctx_size) as p10_old,
-                percentile_cont(0.25) WITHIN GROUP (ORDER BY o.max_lctx_size) as p25_old,
-                percentile_cont(0.50) WITHIN GROUP (ORDER BY o.max_lctx_size) as p50_old,
-                percentile_cont(0.75) WITHIN GROUP (ORDER BY o.max_lctx_size) as p75_old,
-                percentile_cont(0.90) WITHIN GROUP (ORDER BY o.max_lctx_size) as p90_old,
-                percentile_cont(0.99) WITHIN GROUP (ORDER BY o.max_lctx_size) as p99_old,
-                MAX(o.max_lctx_size) as max_old,
-                AVG(o.max_lctx_size) as avg_old
+                ln(o.total::DOUBLE / n.total) as log_speedup,
+                {', '.join(f'coalesce(n.{f}, 0) as {f}' for f in SPEEDUP_MODEL_FEATURES)}
             FROM {old} o
+            JOIN {new} n ON o.declaration = n.declaration
+            WHERE o.total > 0 AND n.total > 0
+        """).fetchnumpy()
+        y = data['log_speedup']
+        features = [f for f in SPEEDUP_MODEL_FEATURES if len(y) > 0 and np.ptp(data[f]) > 0]
+        if len(y) <= len(features) + 1:
+            print(f"  Not enough samples ({len(y)}) to fit the model")
+            return
+        X = add_constant(np.column_stack([np.log1p(data[f].astype(float)) for f in features]), has_constant='add')
+        fit = OLS(y, X).fit(cov_type='HC3')
+        ci = fit.conf_int(alpha=0.05)
+        print(f"  n={len(y)}, R²={fit.rsquared:.3f}, mean speedup (geometric)={np.exp(y.mean()):.3f}x")
+        for name, coef, (lo, hi), p in zip(['intercept'] + features, fit.params, ci, fit.pvalues):
+            print(f"    {name:<20} coef={coef:+.4f}  95% CI=[{lo:+.4f}, {hi:+.4f}]  p={p:.3g}")
+
+        # Feature regions (quantile bins, and pairs of bins) with geometric mean speedup < 1
+        bin_idx = {}
+        bin_edges = {}
+        for f in features:
+            edges = np.unique(np.quantile(data[f], np.linspace(0, 1, bins + 1)))
+            bin_edges[f] = edges
+            bin_idx[f] = np.clip(np.searchsorted(edges, data[f], side='right') - 1, 0, len(edges) - 2)
+
+        def region(*fs: str) -> list[tuple[str, int, float]]:
+            sizes = [len(bin_edges[f]) - 1 for f in fs]
+            cell = np.ravel_multi_index([bin_idx[f] for f in fs], sizes)
+            counts = np.bincount(cell, minlength=np.prod(sizes))
+            sums = np.bincount(cell, weights=y, minlength=np.prod(sizes))
+            regions = []
+            for c in np.flatnonzero((counts >= SPEEDUP_MODEL_MIN_REGION_SIZE) & (sums < 0)):
+                bounds = [f"{f} in [{bin_edges[f][i]:g}, {bin_edges[f][i + 1]:g}]"
+                          for f, i in zip(fs, np.unravel_index(c, sizes))]
+                regions.append((" and ".join(bounds), counts[c], np.exp(sums[c] / counts[c])))
+            return regions
+
+        regressions = [r for f in features for r in region(f)]
+        regressions += [r for i, f in enumerate(features) for g in features[i + 1:] for r in region(f, g)]
+        regressions.sort(key=lambda r: r[2])
+        print(f"  Regions where incremental is slower (geometric mean speedup < 1, n >= {SPEEDUP_MODEL_MIN_REGION_SIZE}):")
+        if not regressions:
+            print("    None")
+        for bounds, n, speedup in regressions[:20]:
+            print(f"    {bounds}: n={n}, speedup={speedup:.3f}x")
+
+    def report_exclusion_funnel(self, *, old_tactic: str, new_tactic: str, frame: str, success_only: bool, exclude_trivial: bool) -> None:
+        # Exclusion analysis: every stage of the funnel as a conditional count over the comparison frame
+        result = self.con.execute(f"""
+            SELECT
+                COUNT(*) as base,
+                COUNT(*) FILTER (WHERE within_timeout) as within_timeout,
+                COUNT(*) FILTER (WHERE within_timeout AND success_match) as success_match,
+                COUNT(*) FILTER (WHERE within_timeout AND success_both) as success_both,
+                COUNT(*) FILTER (WHERE {comparison_filter(success_only=success_only, exclude_trivial=exclude_trivial)}) as included,
+                (SELECT COUNT(*) FROM gathered_{old_tactic} WHERE success = true) as old_solved,
+                (SELECT COUNT(*) FROM gathered_{new_tactic} WHERE success = true) as new_solved
+            FROM {frame}
+        """).fetchone()
+        assert result is not None
+        num_base_decls, num_within_timeout, num_success_match, num_success_both, num_decls, old_solved, new_solved = result
+        num_excluded_timeout = num_base_decls - num_within_timeout
+        num_excluded_success_match = num_within_timeout - num_success_match
+        num_excluded_success_both = num_success_match - num_success_both if success_only else 0
+        num_excluded_trivial = (num_success_both if success_only else num_success_match) - num_decls
+
+        print(f"\nTotal declarations with both old and new results: {num_base_decls}")
+        print(f"Excluded (any time > 11s): {num_excluded_timeout} ({num_excluded_timeout/num_base_decls*100:.2f}%)")
+        print(f"Excluded (different success status): {num_excluded_success_match} ({num_excluded_success_match/num_base_decls*100:.2f}%)")
+        print(f"Excluded (not both successful): {num_excluded_success_both} ({num_excluded_success_both/num_base_decls*100:.2f}%)")
+        if exclude_trivial:
+            print(f"Excluded (trivial): {num_excluded_trivial} ({num_excluded_trivial/num_base_decls*100:.2f}%)")
+        print(f"Included in analysis: {num_decls} ({num_decls/num_base_decls*100:.2f}%)")
+
+        # Problems solved by each variant
+        print(f"\nProblems solved: naive={old_solved}, incremental={new_solved}")
+
+    def report_comparison_metrics(self, *, old_tactic: str, frame: str, decls: str) -> None:
+        # min/avg/max and all quantiles of every metric in one pass over the included declarations
+        result = self.con.execute(f"""
+            SELECT {', '.join(
+                f"{{'min': MIN({c}), 'avg': AVG({c}), 'max': MAX({c}), 'q': quantile_cont({c}, {COMPARISON_QUANTILES})}}"
+                for c in COMPARISON_METRICS)}
+            FROM {frame}
+            WHERE declaration IN (SELECT declaration FROM {decls})
         """).fetchone()
         assert result is not None
-        (min_old_l, p01_old_l, p10_old_l, p25_old_l, p50_old_l, p75_old_l, p90_old_l, p99_old_l, max_old_l, avg_old_l) = result
-        print(f"  min={min_old_l}, p1={p01_old_l:.0f}, p10={p10_old_l:.0f}, p25={p25_old_l:.0f}, p50={p50_old_l:.0f}, avg={avg_old_l:.2f}, p75={p75_old_l:.0f}, p90={p90_old_l:.0f}, p99={p99_old_l:.0f}, max={max_old_l}")
-
-    # Fetch data for scatter plots
-    print("\nGenerating plots...")
-    plot_data = con.execute(f"""
-        SELECT
-            o.total as old_total,
-            n.total as new_total,
-            o.total::DOUBLE / n.total as speedup,
-            n.forward_success,
-            n.forward_total,
-            n.max_depth
-        FROM {old} o
-        JOIN {new} n ON o.declaration = n.declaration
-    """).fetchdf()
-
-    speedup_per_sample = plot_data['speedup']
-
-    # Violin plot for total time distributions
-    plt.figure(figsize=(10, 6))
-    plt.violinplot([plot_data['old_total'] / 1e6, plot_data['new_total'] / 1e6],
-                           positions=[1, 2], showmeans=False, showmedians=True, showextrema=False)
-    plt.xticks([1, 2], ['Naive', 'Incremental'])
-    plt.ylabel('Total Time (ms)')
-    plt.yscale('log')
-    plt.grid(True, alpha=0.3, axis='y')
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_total_time_violin')
-
-    # Scatter plot: old vs new total time
-    plt.figure(figsize=(8, 8))
-    old_ms = plot_data['old_total'] / 1e6
-    new_ms = plot_data['new_total'] / 1e6
-    plt.scatter(old_ms, new_ms, alpha=0.3, s=5)
-    plt.plot([1, 12000], [1, 12000], 'r--', alpha=0.7, label='Parity')
-    plt.xlabel('Naive Total Time (ms)')
-    plt.ylabel('Incremental Total Time (ms)')
-    plt.xscale('log')
-    plt.yscale('log')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_old_vs_new_time')
-
-    # Cumulative solved plot
-    plt.figure(figsize=(10, 6))
-    old_sorted = np.sort(old_ms)
-    new_sorted = np.sort(new_ms)
-    y = np.arange(1, len(old_sorted) + 1)
-    plt.step(old_sorted, y, where='post', label='Naive')
-    plt.step(new_sorted, y, where='post', label='Incremental')
-    plt.xlabel('Time (ms)')
-    plt.ylabel('Problems Solved')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_cumulative_solved')
-
-    plt.figure(figsize=(10, 6))
-    plt.scatter(plot_data['forward_success'], speedup_per_sample, alpha=0.5, s=10)
-    plt.xlabel('Number of Successful Forward Rules (Incremental)')
-    plt.ylabel('Speedup (Naive / Incremental)')
-    plt.axhline(y=1, color='r', linestyle='--', alpha=0.5)
-    save_plot(plots_dir / f"{analysis_name}{plot_suffix}_total_time_vs_success_forward")
-
-    plt.figure(figsize=(10, 6))
-    plt.scatter(plot_data['forward_total'], speedup_per_sample, alpha=0.5, s=10)
-    plt.xlabel('Number of Forward Rules (Incremental)')
-    plt.ylabel('Speedup (Naive / Incremental)')
-    plt.axhline(y=1, color='r', linestyle='--', alpha=0.5)
-    save_plot(plots_dir / f"{analysis_name}{plot_suffix}_total_time_vs_total_forward")
-
-    # Scatter plots with LOWESS trend (all data points)
-    plt.figure(figsize=(10, 6))
-    plt.scatter(plot_data['forward_success'], speedup_per_sample, alpha=0.3, s=5)
-    if len(plot_data) > 3:
-        smoothed = nonparametric.lowess(speedup_per_sample, plot_data['forward_success'], frac=0.2)
-        plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
-        plt.legend()
-    plt.xlabel('Number of Successful Forward Rules (Incremental)')
-    plt.ylabel('Speedup (Naive / Incremental)')
-    plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
-    plt.grid(True, alpha=0.3)
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_speedup_by_success_forward')
-
-    plt.figure(figsize=(10, 6))
-    plt.scatter(plot_data['forward_total'], speedup_per_sample, alpha=0.3, s=5)
-    if len(plot_data) > 3:
-        smoothed = nonparametric.lowess(speedup_per_sample, plot_data['forward_total'], frac=0.2)
-        plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
-        plt.legend()
-    plt.xlabel('Number of Forward Rules (Incremental)')
-    plt.ylabel('Speedup (Naive / Incremental)')
-    plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
-    plt.grid(True, alpha=0.3)
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_speedup_by_total_forward')
-
-    # Average speedup by forward rule count
-    avg_by_success = plot_data.groupby('forward_success')['speedup'].mean()
-    avg_by_total = plot_data.groupby('forward_total')['speedup'].mean()
-
-    plt.figure(figsize=(10, 6))
-    plt.scatter(avg_by_success.index, avg_by_success.values, s=20, alpha=0.6)
-    if len(avg_by_success) > 3:
-        smoothed = nonparametric.lowess(avg_by_success.values, avg_by_success.index, frac=0.2)
-        plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
-        plt.legend()
-    plt.xlabel('Number of Successful Forward Rules (Incremental)')
-    plt.ylabel('Avg Speedup (Naive / Incremental)')
-    plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
-    plt.grid(True, alpha=0.3)
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_avg_speedup_by_success_forward')
-
-    plt.figure(figsize=(10, 6))
-    plt.scatter(avg_by_total.index, avg_by_total.values, s=20, alpha=0.6)
-    if len(avg_by_total) > 3:
-        smoothed = nonparametric.lowess(avg_by_total.values, avg_by_total.index, frac=0.2)
-        plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
-        plt.legend()
-    plt.xlabel('Number of Forward Rules (Incremental)')
-    plt.ylabel('Avg Speedup (Naive / Incremental)')
-    plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
-    plt.grid(True, alpha=0.3)
-    save_plot(plots_dir / f'{analysis_name}{plot_suffix}_avg_speedup_by_total_forward')
-
-    # Speedup by goal depth (only for Aesop tactics)
-    if old_tactic in aesop_tactics:
-        depth_data = plot_data[plot_data['max_depth'].notna()]
-        if len(depth_data) > 0:
-            # Filter outliers using IQR with factor 3
-            q1 = depth_data['speedup'].quantile(0.25)
-            q3 = depth_data['speedup'].quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - 3 * iqr
-            upper = q3 + 3 * iqr
-            depth_data_filtered = depth_data[(depth_data['speedup'] >= lower) & (depth_data['speedup'] <= upper)]
+        stats = {c: quantile_summary(s) for c, s in zip(COMPARISON_METRICS, result)}
+
+        def print_time_summary(old: dict, new: dict, scale: float) -> None:
+            keys = ['min', 'p1', 'p10', 'p25', 'p50', 'avg', 'p75', 'p90', 'p99', 'max']
+            print("  Old: " + ", ".join(f"{k}={old[k]/scale:.2f}ms" for k in keys))
+            print("  New: " + ", ".join(f"{k}={new[k]/scale:.2f}ms" for k in keys))
+            print("  Time difference (old - new): " + ", ".join(f"{k}={(old[k]-new[k])/scale:.2f}ms" for k in keys))
+            print("  Speedup (old/new): " + ", ".join(f"{k}={old[k]/new[k]:.3f}x" for k in keys))
+
+        print("\nTotal time (aesopstats):")
+        print_time_summary(stats['old_total'], stats['new_total'], 1e6)
+
+        print("\nTotal time (gatheredresult):")
+        print_time_summary(stats['old_time'], stats['new_time'], 1)
+
+        print("\nMax instantiations per sample (new):")
+        s = stats['new_max_instantiations']
+        def fmt(v): return f"{v:.0f}" if v is not None else "N/A"
+        print(f"  min={s['min'] or 0}, p25={fmt(s['p25'])}, p50={fmt(s['p50'])}, p75={fmt(s['p75'])}, p90={fmt(s['p90'])}, p95={fmt(s['p95'])}, p99={fmt(s['p99'])}, max={s['max'] or 0}, avg={fmt(s['avg'])}")
+
+        if old_tactic in aesop_tactics:
+            for title, column in [("Maximum depth per sample (old)", 'old_max_depth'),
+                                  ("Maximum local context size per sample (old)", 'old_max_lctx_size')]:
+                print(f"\n{title}:")
+                s = stats[column]
+                print(f"  min={s['min']}, p1={s['p1']:.0f}, p10={s['p10']:.0f}, p25={s['p25']:.0f}, p50={s['p50']:.0f}, avg={s['avg']:.2f}, p75={s['p75']:.0f}, p90={s['p90']:.0f}, p99={s['p99']:.0f}, max={s['max']}")
+
+    def plot_comparison(self, *, old_tactic: str, old: str, new: str, prefix: str) -> None:
+        """Plot time distributions and speedup against forward reasoning features to `plots/{prefix}_*.pdf`."""
+        plots_dir = self.plots_dir
+
+        # Fetch data for scatter plots
+        print("\nGenerating plots...")
+        plot_data = fetch_columns(self.con.execute(f"""
+            SELECT
+                o.total as old_total,
+                n.total as new_total,
+                o.total::DOUBLE / n.total as speedup,
+                n.forward_success,
+                n.forward_total,
+                n.max_depth
+            FROM {old} o
+            JOIN {new} n ON o.declaration = n.declaration
+        """))
 
+        speedup_per_sample = plot_data['speedup']
+
+        with plt.rc_context(PLOT_RC):
+            # Violin plot for total time distributions
             plt.figure(figsize=(10, 6))
-            plt.scatter(depth_data_filtered['max_depth'], depth_data_filtered['speedup'], alpha=0.3, s=5)
-            if len(depth_data_filtered) > 3:
-                smoothed = nonparametric.lowess(depth_data_filtered['speedup'], depth_data_filtered['max_depth'], frac=0.2)
+            plt.violinplot([plot_data['old_total'] / 1e6, plot_data['new_total'] / 1e6],
+                                   positions=[1, 2], showmeans=False, showmedians=True, showextrema=False)
+            plt.xticks([1, 2], ['Naive', 'Incremental'])
+            plt.ylabel('Total Time (ms)')
+            plt.yscale('log')
+            plt.grid(True, alpha=0.3, axis='y')
+            save_plot(plots_dir / f'{prefix}_total_time_violin')
+
+            # Scatter plot: old vs new total time
+            plt.figure(figsize=(8, 8))
+            old_ms = plot_data['old_total'] / 1e6
+            new_ms = plot_data['new_total'] / 1e6
+            plt.scatter(old_ms, new_ms, alpha=0.3, s=5)
+            plt.plot([1, 12000], [1, 12000], 'r--', alpha=0.7, label='Parity')
+            plt.xlabel('Naive Total Time (ms)')
+            plt.ylabel('Incremental Total Time (ms)')
+            plt.xscale('log')
+            plt.yscale('log')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+            save_plot(plots_dir / f'{prefix}_old_vs_new_time')
+
+            # Cumulative solved plot
+            plt.figure(figsize=(10, 6))
+            old_sorted = np.sort(old_ms)
+            new_sorted = np.sort(new_ms)
+            y = np.arange(1, len(old_sorted) + 1)
+            plt.step(old_sorted, y, where='post', label='Naive')
+            plt.step(new_sorted, y, where='post', label='Incremental')
+            plt.xlabel('Time (ms)')
+            plt.ylabel('Problems Solved')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+            save_plot(plots_dir / f'{prefix}_cumulative_solved')
+
+            plt.figure(figsize=(10, 6))
+            plt.scatter(plot_data['forward_success'], speedup_per_sample, alpha=0.5, s=10)
+            plt.xlabel('Number of Successful Forward Rules (Incremental)')
+            plt.ylabel('Speedup (Naive / Incremental)')
+            plt.axhline(y=1, color='r', linestyle='--', alpha=0.5)
+            save_plot(plots_dir / f"{prefix}_total_time_vs_success_forward")
+
+            plt.figure(figsize=(10, 6))
+            plt.scatter(plot_data['forward_total'], speedup_per_sample, alpha=0.5, s=10)
+            plt.xlabel('Number of Forward Rules (Incremental)')
+            plt.ylabel('Speedup (Naive / Incremental)')
+            plt.axhline(y=1, color='r', linestyle='--', alpha=0.5)
+            save_plot(plots_dir / f"{prefix}_total_time_vs_total_forward")
+
+            # Scatter plots with LOWESS trend (all data points)
+            plt.figure(figsize=(10, 6))
+            plt.scatter(plot_data['forward_success'], speedup_per_sample, alpha=0.3, s=5)
+            if len(speedup_per_sample) > 3:
+                smoothed = nonparametric.lowess(speedup_per_sample, plot_data['forward_success'], frac=0.2)
                 plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
                 plt.legend()
-            plt.xlabel('Maximum Goal Depth (Incremental)')
+            plt.xlabel('Number of Successful Forward Rules (Incremental)')
             plt.ylabel('Speedup (Naive / Incremental)')
             plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
             plt.grid(True, alpha=0.3)
-            save_plot(plots_dir / f'{analysis_name}{plot_suffix}_speedup_by_depth')
+            save_plot(plots_dir / f'{prefix}_speedup_by_success_forward')
 
-            # Violin plot
-            depth_groups = [depth_data_filtered[depth_data_filtered['max_depth'] == d]['speedup'].values
-                           for d in sorted(depth_data_filtered['max_depth'].unique())]
-            depth_positions = sorted(depth_data_filtered['max_depth'].unique())
+            plt.figure(figsize=(10, 6))
+            plt.scatter(plot_data['forward_total'], speedup_per_sample, alpha=0.3, s=5)
+            if len(speedup_per_sample) > 3:
+                smoothed = nonparametric.lowess(speedup_per_sample, plot_data['forward_total'], frac=0.2)
+                plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
+                plt.legend()
+            plt.xlabel('Number of Forward Rules (Incremental)')
+            plt.ylabel('Speedup (Naive / Incremental)')
+            plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
+            plt.grid(True, alpha=0.3)
+            save_plot(plots_dir / f'{prefix}_speedup_by_total_forward')
 
-            plt.figure(figsize=(12, 6))
-            plt.violinplot(depth_groups, positions=depth_positions, showmeans=False, showmedians=True, showextrema=False)
+            # Average speedup by forward rule count
+            success_counts, avg_by_success = group_mean(plot_data['forward_success'], speedup_per_sample)
+            total_counts, avg_by_total = group_mean(plot_data['forward_total'], speedup_per_sample)
 
-            # Add sample counts
-            y_max = depth_data_filtered['speedup'].max()
-            for pos, group in zip(depth_positions, depth_groups):
-                plt.text(pos, y_max * 1.02, f'n={len(group)}', ha='center', va='bottom', fontsize=18, rotation=90)
+            plt.figure(figsize=(10, 6))
+            plt.scatter(success_counts, avg_by_success, s=20, alpha=0.6)
+            if len(avg_by_success) > 3:
+                smoothed = nonparametric.lowess(avg_by_success, success_counts, frac=0.2)
+                plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
+                plt.legend()
+            plt.xlabel('Number of Successful Forward Rules (Incremental)')
+            plt.ylabel('Avg Speedup (Naive / Incremental)')
+            plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
+            plt.grid(True, alpha=0.3)
+            save_plot(plots_dir / f'{prefix}_avg_speedup_by_success_forward')
 
-            plt.xlabel('Maximum Goal Depth (Incremental)')
-            plt.ylabel('Speedup (Naive / Incremental)')
+            plt.figure(figsize=(10, 6))
+            plt.scatter(total_counts, avg_by_total, s=20, alpha=0.6)
+            if len(avg_by_total) > 3:
+                smoothed = nonparametric.lowess(avg_by_total, total_counts, frac=0.2)
+                plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
+                plt.legend()
+            plt.xlabel('Number of Forward Rules (Incremental)')
+            plt.ylabel('Avg Speedup (Naive / Incremental)')
             plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
+            plt.grid(True, alpha=0.3)
+            save_plot(plots_dir / f'{prefix}_avg_speedup_by_total_forward')
+
+            # Speedup by goal depth (only for Aesop tactics)
+            if old_tactic in aesop_tactics:
+                has_depth = ~np.isnan(plot_data['max_depth'])
+                depth, depth_speedup = plot_data['max_depth'][has_depth], speedup_per_sample[has_depth]
+                if len(depth) > 0:
+                    # Filter outliers using IQR with factor 3
+                    q1, q3 = np.nanquantile(depth_speedup, [0.25, 0.75])
+                    iqr = q3 - q1
+                    lower = q1 - 3 * iqr
+                    upper = q3 + 3 * iqr
+                    keep = (depth_speedup >= lower) & (depth_speedup <= upper)
+                    depth, depth_speedup = depth[keep], depth_speedup[keep]
+
+                    plt.figure(figsize=(10, 6))
+                    plt.scatter(depth, depth_speedup, alpha=0.3, s=5)
+                    if len(depth) > 3:
+                        smoothed = nonparametric.lowess(depth_speedup, depth, frac=0.2)
+                        plt.plot(smoothed[:, 0], smoothed[:, 1], 'r-', linewidth=2, label='LOWESS trend')
+                        plt.legend()
+                    plt.xlabel('Maximum Goal Depth (Incremental)')
+                    plt.ylabel('Speedup (Naive / Incremental)')
+                    plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
+                    plt.grid(True, alpha=0.3)
+                    save_plot(plots_dir / f'{prefix}_speedup_by_depth')
+
+                    # Violin plot, one group per depth: split the depth-sorted speedups at each new depth
+                    order = np.argsort(depth, kind='stable')
+                    depth_positions, starts = np.unique(depth[order], return_index=True)
+                    depth_groups = np.split(depth_speedup[order], starts[1:])
+
+                    plt.figure(figsize=(12, 6))
+                    plt.violinplot(depth_groups, positions=depth_positions, showmeans=False, showmedians=True, showextrema=False)
+
+                    # Add sample counts
+                    y_max = depth_speedup.max()
+                    for pos, group in zip(depth_positions, depth_groups):
+                        plt.text(pos, y_max * 1.02, f'n={len(group)}', ha='center', va='bottom', fontsize=18, rotation=90)
+
+                    plt.xlabel('Maximum Goal Depth (Incremental)')
+                    plt.ylabel('Speedup (Naive / Incremental)')
+                    plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5)
+                    plt.grid(True, alpha=0.3, axis='y')
+                    plt.ylim(top=y_max * 1.10)
+                    save_plot(plots_dir / f'{prefix}_speedup_by_depth_violin')
+
+    def phase_breakdown(self, *, old_tactic: str, new_tactic: str, old: str, new: str, prefix: str,
+                        buckets: int = 5, top_n: int = 5) -> None:
+        """Split Aesop time into its phase timers and harness time into Aesop and unexplained overhead.
+
+        Overhead is the gathered (harness) time minus Aesop's total, i.e. elaboration and kernel
+        checking of the proof. Buckets are quantiles of the naive total time, shared by both variants.
+        """
+        print("\nPhase breakdown (aesopstats):")
+        parts = PHASES + ['other']
+        def sample(variant: str, view: str, tactic: str) -> str:
+            return f"""
+                SELECT '{variant}' as variant, p.bucket, a.declaration, a.total,
+                    {', '.join(f'coalesce(a.{ph}, 0) as {ph}' for ph in PHASES)},
+                    a.total - ({' + '.join(f'coalesce(a.{ph}, 0)' for ph in PHASES)}) as other,
+                    g.time * 1e6 - a.total as overhead,
+                    g.time * 1e6 as gathered
+                FROM {view} a
+                JOIN pairs p ON a.declaration = p.declaration
+                JOIN gathered_{tactic} g ON a.declaration = g.declaration
+            """
+        rows = self.con.execute(f"""
+            WITH pairs AS (
+                SELECT o.declaration, ntile({buckets}) OVER (ORDER BY o.total) as bucket
+                FROM {old} o
+                JOIN {new} n ON o.declaration = n.declaration
+            ),
+            samples AS (
+                {sample('old', old, old_tactic)}
+                UNION ALL
+                {sample('new', new, new_tactic)}
+            )
+            SELECT
+                variant,
+                bucket,
+                COUNT(*) as n,
+                SUM(total) as total_sum,
+                {', '.join(f'SUM({ph}) as {ph}_sum, quantile_cont({ph}, [0.5, 0.9]) as {ph}_q' for ph in parts)},
+                SUM(overhead) as overhead_sum,
+                SUM(gathered) as gathered_sum,
+                quantile_cont(overhead, [0.5, 0.9, 0.99]) as overhead_q,
+                max_by(declaration, overhead, {top_n}) as overhead_decls,
+                max(overhead, {top_n}) as overhead_top
+            FROM samples
+            GROUP BY GROUPING SETS ((variant), (variant, bucket))
+            ORDER BY variant, bucket
+        """).fetchdf()
+        if len(rows) == 0:
+            print("  No samples")
+            return
+        totals = rows[rows['bucket'].isna()].set_index('variant')
+        per_bucket = rows[rows['bucket'].notna()]
+        old_row, new_row = totals.loc['old'], totals.loc['new']
+        n = old_row['n']
+
+        saved = old_row['total_sum'] - new_row['total_sum']
+        print(f"  n={n:.0f}, mean total: naive={old_row['total_sum']/n/1e6:.2f}ms, incremental={new_row['total_sum']/n/1e6:.2f}ms, "
+              f"saved={saved/n/1e6:.2f}ms per sample")
+        # Shares of a near-zero net saving are meaningless, so only report them for a saving of at least 5%
+        meaningful_saving = abs(saved) >= 0.05 * old_row['total_sum']
+        print(f"  {'phase':<20} {'naive mean/p50/p90 (ms)':>28} {'incr. mean/p50/p90 (ms)':>28} {'saved (ms)':>11} "
+              f"{'% of naive':>11} {'share of saving':>16}")
+        for ph in parts:
+            o_q, n_q = old_row[f'{ph}_q'], new_row[f'{ph}_q']
+            delta = old_row[f'{ph}_sum'] - new_row[f'{ph}_sum']
+            of_naive = f"{delta / old_row['total_sum'] * 100:.1f}%" if old_row['total_sum'] != 0 else "N/A"
+            share = f"{delta / saved * 100:.1f}%" if meaningful_saving else "N/A"
+            name = ph if ph != 'other' else 'other (unattributed)'
+            print(f"  {name:<20} {old_row[f'{ph}_sum']/n/1e6:>10.2f}/{o_q[0]/1e6:.2f}/{o_q[1]/1e6:.2f}"
+                  f" {new_row[f'{ph}_sum']/n/1e6:>14.2f}/{n_q[0]/1e6:.2f}/{n_q[1]/1e6:.2f}"
+                  f" {delta/n/1e6:>13.2f} {of_naive:>11} {share:>16}")
+
+        print("  Unexplained harness overhead (gathered time - Aesop total, per declaration):")
+        for variant, label in [('old', 'Naive'), ('new', 'Incremental')]:
+            row = totals.loc[variant]
+            q = row['overhead_q']
+            top = ", ".join(f"{d} ({t/1e6:.1f}ms)" for d, t in zip(row['overhead_decls'], row['overhead_top']))
+            print(f"    {label}: mean={row['overhead_sum']/n/1e6:.2f}ms, p50={q[0]/1e6:.2f}ms, p90={q[1]/1e6:.2f}ms, "
+                  f"p99={q[2]/1e6:.2f}ms, {row['overhead_sum']/row['gathered_sum']*100:.2f}% of gathered time")
+            print(f"      Largest: {top}")
+
+        # Stacked mean phase time per bucket of naive total time, naive and incremental side by side
+        with plt.rc_context(PLOT_RC):
+            plt.figure(figsize=(12, 6))
+            width = 0.4
+            for offset, (variant, hatch) in zip([-width / 2, width / 2], [('old', ''), ('new', '//')]):
+                part = per_bucket[per_bucket['variant'] == variant].sort_values('bucket')
+                bottom = np.zeros(len(part))
+                for i, ph in enumerate(parts):
+                    mean_ms = (part[f'{ph}_sum'] / part['n'] / 1e6).to_numpy()
+                    plt.bar(part['bucket'].to_numpy() + offset, mean_ms, width, bottom=bottom, color=f'C{i}', hatch=hatch,
+                            edgecolor='white', label=ph if variant == 'old' else None)
+                    bottom += mean_ms
+            plt.yscale('log')
+            plt.xlabel('Naive Total Time Quantile (left: Naive, right: Incremental)')
+            plt.ylabel('Mean Time (ms)')
+            plt.legend(fontsize=12)
             plt.grid(True, alpha=0.3, axis='y')
-            plt.ylim(top=y_max * 1.10)
-            save_plot(plots_dir / f'{analysis_name}{plot_suffix}_speedup_by_depth_violin')
-
-    # Export slowdowns
-    print("\nExporting declarations with significant slowdowns...")
-    slowdowns = con.execute(f"""
-        SELECT
-            n.declaration,
-            n.file,
-            n.syntax,
-            o.total / 1e6 as old_time_ms,
-            n.total / 1e6 as new_time_ms,
-            n.total::DOUBLE / o.total as slowdown
-        FROM {old} o
-        JOIN {new} n ON o.declaration = n.declaration
-        WHERE n.total > o.total * 1.5
-            AND n.total >= 50e6
-        ORDER BY slowdown DESC
-    """).fetchdf()
-
-    if len(slowdowns) > 0:
-        slowdowns_file = samples_dir / f"{analysis_name}{plot_suffix}_slowdowns.txt"
-        export_samples(slowdowns, slowdowns_file)
-        print(f"  Exported {len(slowdowns)} slowdowns to {slowdowns_file}")
-    else:
-        print(f"  No significant slowdowns found")
-
-    # Export slowdowns with many forward rules
-    slowdowns_many_forward = con.execute(f"""
-        SELECT
-            n.declaration,
-            n.file,
-            n.syntax,
-            o.total / 1e6 as old_time_ms,
-            n.total / 1e6 as new_time_ms,
-            n.total::DOUBLE / o.total as slowdown
-        FROM {old} o
-        JOIN {new} n ON o.declaration = n.declaration
-        WHERE n.total > o.total * 1.5
-            AND n.total >= 50e6
-            AND n.forward_total >= 20
-        ORDER BY slowdown DESC
-    """).fetchdf()
-
-    if len(slowdowns_many_forward) > 0:
-        slowdowns_many_forward_file = samples_dir / f"{analysis_name}{plot_suffix}_slowdowns_many_forward.txt"
-        export_samples(slowdowns_many_forward, slowdowns_many_forward_file)
-        print(f"  Exported {len(slowdowns_many_forward)} slowdowns with >=20 forward rules to {slowdowns_many_forward_file}")
-    else:
-        print(f"  No significant slowdowns with >=20 forward rules found")
-
-    # Export samples with high depth (only for Aesop tactics)
-    if old_tactic in aesop_tactics:
-        high_depth = con.execute(f"""
+            save_plot(self.plots_dir / f'{prefix}_phase_breakdown')
+
+    def export_comparison_samples(self, *, old_tactic: str, old: str, new: str, prefix: str) -> None:
+        """Export slowdowns and high-depth samples to `samples/{prefix}_*.txt`."""
+        samples_dir = self.samples_dir
+
+        # Export slowdowns
+        print("\nExporting declarations with significant slowdowns...")
+        slowdowns = fetch_columns(self.con.execute(f"""
             SELECT
                 n.declaration,
                 n.file,
                 n.syntax,
                 o.total / 1e6 as old_time_ms,
                 n.total / 1e6 as new_time_ms,
-                n.total::DOUBLE / o.total as slowdown,
-                n.max_depth
+                n.total::DOUBLE / o.total as slowdown
             FROM {old} o
             JOIN {new} n ON o.declaration = n.declaration
-            WHERE n.max_depth >= 20
+            WHERE n.total > o.total * 1.5
+                AND n.total >= 50e6
             ORDER BY slowdown DESC
-        """).fetchdf()
+        """))
+
+        if len(slowdowns['declaration']) > 0:
+            slowdowns_file = samples_dir / f"{prefix}_slowdowns.txt"
+            export_samples(slowdowns, slowdowns_file)
+            print(f"  Exported {len(slowdowns['declaration'])} slowdowns to {slowdowns_file}")
+        else:
+            print(f"  No significant slowdowns found")
+
+        # Export slowdowns with many forward rules
+        slowdowns_many_forward = fetch_columns(self.con.execute(f"""
+            SELECT
+                n.declaration,
+                n.file,
+                n.syntax,
+                o.total / 1e6 as old_time_ms,
+                n.total / 1e6 as new_time_ms,
+                n.total::DOUBLE / o.total as slowdown
+            FROM {old} o
+            JOIN {new} n ON o.declaration = n.declaration
+            WHERE n.total > o.total * 1.5
+                AND n.total >= 50e6
+                AND n.forward_total >= 20
+            ORDER BY slowdown DESC
+        """))
 
-        if len(high_depth) > 0:
-            high_depth_file = samples_dir / f"{analysis_name}{plot_suffix}_high_depth.txt"
-            export_samples(high_depth, high_depth_file)
-            print(f"  Exported {len(high_depth)} samples with depth >=20 to {high_depth_file}")
+        if len(slowdowns_many_forward['declaration']) > 0:
+            slowdowns_many_forward_file = samples_dir / f"{prefix}_slowdowns_many_forward.txt"
+            export_samples(slowdowns_many_forward, slowdowns_many_forward_file)
+            print(f"  Exported {len(slowdowns_many_forward['declaration'])} slowdowns with >=20 forward rules to {slowdowns_many_forward_file}")
         else:
-            print(f"  No samples with depth >=20 found")
-
-    con.execute(f"DROP TABLE {decls}")
-
-# Check if useAesop data (used for triviality filtering) is available
-has_use_aesop = False
-result = con.execute("SELECT COUNT(*) FROM gathered_useAesop").fetchone()
-if result is not None:
-    has_use_aesop = result[0] > 0
-
-# 'useAesopPUnsafeOld', 'useAesopPUnsafeNew', 'useSaturateNewDAss', 'useSaturateOldDAs'
-compare_tactics(old_tactic='useAesopPUnsafeOld', new_tactic='useAesopPUnsafeNew', analysis_name='aesop', success_only=False)
-compare_tactics(old_tactic='useAesopPUnsafeOld', new_tactic='useAesopPUnsafeNew', analysis_name='aesop', success_only=True)
-if has_use_aesop:
-    compare_tactics(old_tactic='useAesopPUnsafeOld', new_tactic='useAesopPUnsafeNew', analysis_name='aesop', success_only=False, exclude_trivial=True)
-    compare_tactics(old_tactic='useAesopPUnsafeOld', new_tactic='useAesopPUnsafeNew', analysis_name='aesop', success_only=True, exclude_trivial=True)
-compare_tactics(old_tactic='useSaturateOldDAs', new_tactic='useSaturateNewDAss', analysis_name='saturate', success_only=False)
-compare_tactics(old_tactic='useSaturateOldDAs', new_tactic='useSaturateNewDAss', analysis_name='saturate', success_only=True)
+            print(f"  No significant slowdowns with >=20 forward rules found")
+
+        # Export samples with high depth (only for Aesop tactics)
+        if old_tactic in aesop_tactics:
+            high_depth = fetch_columns(self.con.execute(f"""
+                SELECT
+                    n.declaration,
+                    n.file,
+                    n.syntax,
+                    o.total / 1e6 as old_time_ms,
+                    n.total / 1e6 as new_time_ms,
+                    n.total::DOUBLE / o.total as slowdown,
+                    n.max_depth
+                FROM {old} o
+                JOIN {new} n ON o.declaration = n.declaration
+                WHERE n.max_depth >= 20
+                ORDER BY slowdown DESC
+            """))
+
+            if len(high_depth['declaration']) > 0:
+                high_depth_file = samples_dir / f"{prefix}_high_depth.txt"
+                export_samples(high_depth, high_depth_file)
+                print(f"  Exported {len(high_depth['declaration'])} samples with depth >=20 to {high_depth_file}")
+            else:
+                print(f"  No samples with depth >=20 found")
+
+    def compare_tactics(self, *, old_tactic: str, new_tactic: str, analysis_name: str, success_only=False, exclude_trivial=False,
+                        steps: list[str] = COMPARISON_STEPS + ['censored']) -> None:
+        """Compare two tactics, optionally filtering for successful samples only."""
+        con = self.con
+
+        print_header(f"Analysis {analysis_name}{" (only successful)" if success_only else ""}{" (excluding trivial)" if exclude_trivial else ""}")
+
+        plot_suffix = "_success_only" if success_only else "_all"
+        if exclude_trivial:
+            plot_suffix += "_nontrivial"
+        prefix = f"{analysis_name}{plot_suffix}"
+
+        # Create table with declarations included in analysis
+        frame = self.comparison_frame(old_tactic=old_tactic, new_tactic=new_tactic)
+        decls = f"{analysis_name}_decls"
+        con.execute(f"""
+            CREATE TEMP TABLE {decls} AS
+            SELECT declaration FROM {frame}
+            WHERE {comparison_filter(success_only=success_only, exclude_trivial=exclude_trivial)}
+        """)
+        con.execute(f"CREATE UNIQUE INDEX {decls}_idx ON {decls} (declaration)")
+
+        if 'metrics' in steps:
+            self.report_exclusion_funnel(old_tactic=old_tactic, new_tactic=new_tactic, frame=frame,
+                                         success_only=success_only, exclude_trivial=exclude_trivial)
+
+        # Censored stats cover every declaration with results for both tactics, whatever their
+        # outcome, so they only differ between the success_only variants by the triviality filter
+        if 'censored' in steps and not success_only:
+            self.censored_solver_stats(
+                tactics=[old_tactic, new_tactic],
+                labels=['Naive', 'Incremental'],
+                plot_path=self.plots_dir / f'{prefix}_km_cumulative_solved',
+                decls=f"""
+                    SELECT declaration FROM gathered_unfiltered WHERE tactic = '{old_tactic}'
+                    INTERSECT
+                    SELECT declaration FROM gathered_unfiltered WHERE tactic = '{new_tactic}'
+                    {"EXCEPT SELECT declaration FROM gathered_useAesop WHERE success = true" if exclude_trivial else ""}
+                """,
+            )
+
+        # Create views with filtered declarations
+        old = f"{analysis_name}_old"
+        con.execute(f"""
+            CREATE OR REPLACE TEMP VIEW {old} AS
+            SELECT *
+            FROM aesop_{old_tactic}
+            WHERE declaration IN (SELECT declaration FROM {decls})
+        """)
+
+        new = f"{analysis_name}_new"
+        con.execute(f"""
+            CREATE OR REPLACE TEMP VIEW {new} AS
+            SELECT *
+            FROM aesop_{new_tactic}
+            WHERE declaration IN (SELECT declaration FROM {decls})
+        """)
+
+        if 'metrics' in steps:
+            self.report_comparison_metrics(old_tactic=old_tactic, frame=frame, decls=decls)
+        if 'plots' in steps:
+            self.plot_comparison(old_tactic=old_tactic, old=old, new=new, prefix=prefix)
+        if 'model' in steps:
+            self.model_speedup(old=old, new=new)
+        if 'phases' in steps:
+            self.phase_breakdown(old_tactic=old_tactic, new_tactic=new_tactic, old=old, new=new, prefix=prefix)
+        if 'samples' in steps:
+            self.export_comparison_samples(old_tactic=old_tactic, old=old, new=new, prefix=prefix)
+        if 'rules' in steps:
+            self.analyze_rule_costs(old=old, new=new, rule_costs_file=self.samples_dir / f"{prefix}_rule_costs.txt")
+
+        con.execute(f"DROP TABLE {decls}")
+
+    def report_comparisons(self, steps: list[str] = COMPARISON_STEPS + ['censored']) -> None:
+        # Check if useAesop data (used for triviality filtering) is available
+        has_use_aesop = self.tactic_gathered('useAesop').count('*').fetchone()[0] > 0
+
+        for comparison in COMPARISONS:
+            if comparison.get('exclude_trivial') and not has_use_aesop:
+                continue
+            self.compare_tactics(**comparison, steps=steps)
+
+    def run(self, steps: list[str] = STEPS) -> None:
+        """Print the report sections in `steps`, in report order."""
+        if 'basic' in steps:
+            self.report_basic_stats()
+        if any(step in steps for step in ['exclusions', 'sanity']):
+            # Split data by tactic and compute metrics
+            print("Splitting data by tactic and computing metrics...")
+            self.materialize_tactics(tactics)
+        if 'exclusions' in steps:
+            self.report_exclusions()
+        if 'sanity' in steps:
+            self.report_sanity_checks()
+        if 'outcomes' in steps:
+            self.report_time_by_outcome()
+        if 'censored' in steps:
+            self.report_censored_stats()
+        if any(step in steps for step in COMPARISON_STEPS):
+            self.report_comparisons(steps)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Analyze Aesop tactic performance')
+    parser.add_argument('input_dir', type=Path, help='Input directory containing parquet files')
+    parser.add_argument('output_dir', type=Path, help='Output directory for results and plots')
+    parser.add_argument('--steps', nargs='+', choices=STEPS, default=STEPS,
+                        help='Report sections to run (default: all)')
+    args = parser.parse_args()
+
+    # Create output directory
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Results will be saved in {args.output_dir.absolute()}/")
+
+    print("Loading datasets...")
+    analysis = Analysis(args.input_dir, args.output_dir)
+    analysis.run(args.steps)
+
+if __name__ == '__main__':
+    main()
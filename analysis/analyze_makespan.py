@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""Worker occupancy, parallel efficiency and stragglers of a natural benchmark run.
+
+Reads the launcher timestamps in `evaluateFiles.txt` (`<module> @ <mono ms> <wall ms>`
+when a module is launched, `<module> : <retcode> @ <mono ms> <wall ms>` when it
+finishes) and replays the schedule: how many workers were busy over time, how
+much of `nprocs × makespan` was spent evaluating modules, which modules made up
+the tail, and which makespan the same modules would reach with another launch
+order (longest processing time first) or another number of processes.
+"""
+import argparse
+import heapq
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from plotting import PLOT_RC, save_plot
+
+# Exit code of `timeout` when it kills a module that exceeded `timeLimitS`
+TIMEOUT_RETCODE = 124
+
+def parse_evaluate_files(path: Path) -> pd.DataFrame:
+    """One row per launched module with launch/finish times in s relative to the first launch."""
+    launches = {}
+    finishes = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry, sep, stamp = line.partition(" @ ")
+            if not sep:
+                raise SystemExit(f"{path} has no launcher timestamps (written by an older launcher)")
+            mono_ms, wall_ms = (int(v) for v in stamp.split())
+            module, sep, retcode = entry.partition(" : ")
+            if sep:
+                finishes[module] = (int(retcode), mono_ms, wall_ms)
+            else:
+                launches[module] = (mono_ms, wall_ms)
+
+    if not launches:
+        raise SystemExit(f"{path} has no module launches")
+    start = min(mono for mono, _ in launches.values())
+    rows = []
+    for module, (launch_mono, launch_wall) in launches.items():
+        retcode, finish_mono, finish_wall = finishes.get(module, (None, None, None))
+        rows.append({
+            "module": module,
+            "launch": (launch_mono - start) / 1e3,
+            "finish": (finish_mono - start) / 1e3 if finish_mono is not None else np.nan,
+            "retcode": retcode,
+            "launch_wall": pd.Timestamp(launch_wall, unit="ms"),
+        })
+    df = pd.DataFrame(rows).sort_values("launch", ignore_index=True)
+    df["duration"] = df["finish"] - df["launch"]
+    return df
+
+def occupancy(launch: np.ndarray, finish: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Step function (times, busy workers from that time on) of the schedule."""
+    times = np.concatenate([launch, finish])
+    deltas = np.concatenate([np.ones(len(launch)), -np.ones(len(finish))])
+    # Finishes before launches at the same time, so a freed worker is not counted twice
+    order = np.lexsort((deltas, times))
+    return times[order], np.cumsum(deltas[order])
+
+def list_schedule(durations: np.ndarray, nprocs: int) -> float:
+    """Makespan of launching `durations` in order, each on the first free of `nprocs` workers."""
+    workers = [0.0] * min(nprocs, len(durations))
+    for d in durations:
+        heapq.heapreplace(workers, workers[0] + d)
+    return max(workers, default=0.0)
+
+def report(df: pd.DataFrame, nprocs: int | None, time_limit_s: float | None, top_n: int, plot: Path | None) -> None:
+    unfinished = df[df["finish"].isna()]
+    df = df[df["finish"].notna()]
+    durations = df["duration"].to_numpy()
+    times, busy = occupancy(df["launch"].to_numpy(), df["finish"].to_numpy())
+    makespan = df["finish"].max()
+    max_busy = int(busy.max())
+    if nprocs is None:
+        nprocs = max_busy
+    elif nprocs < max_busy:
+        raise SystemExit(f"--nprocs {nprocs} is below the observed concurrency of {max_busy} running modules")
+
+    print("="*80)
+    print("SCHEDULE")
+    print("="*80)
+    print(f"\nModules: {len(df)} finished, {len(unfinished)} never finished")
+    print(f"Started: {df['launch_wall'].min()} UTC")
+    print(f"Makespan: {makespan/3600:.2f}h ({makespan:.0f}s), nprocs={nprocs} (at most {max_busy} running)")
+    busy_time = durations.sum()
+    efficiency = busy_time / (nprocs * makespan)
+    lower_bound = max(busy_time / nprocs, durations.max())
+    print(f"Module time: {busy_time/3600:.2f}h, parallel efficiency={efficiency * 100:.2f}%, "
+          f"idle worker time={(nprocs * makespan - busy_time)/3600:.2f}h")
+    print(f"Makespan lower bound max(total/nprocs, longest module): {lower_bound:.0f}s "
+          f"({makespan / lower_bound:.3f}x of observed)")
+
+    # Time-weighted distribution of busy workers
+    spans = np.diff(times)
+    print("\nBusy workers (share of makespan):")
+    for lo, hi in [(nprocs, nprocs), (nprocs * 3 // 4, nprocs - 1), (nprocs // 2, nprocs * 3 // 4 - 1), (0, nprocs // 2 - 1)]:
+        if hi < lo:
+            continue
+        share = spans[(busy[:-1] >= lo) & (busy[:-1] <= hi)].sum() / makespan
+        print(f"  {lo}-{hi}: {share * 100:.2f}%" if lo != hi else f"  {lo}: {share * 100:.2f}%")
+
+    last_launch = df["launch"].max()
+    print(f"\nTail after the last launch: {makespan - last_launch:.0f}s ({(makespan - last_launch) / makespan * 100:.2f}% of makespan)")
+
+    killed = df[df["retcode"] != 0]
+    timed_out = killed[killed["retcode"] == TIMEOUT_RETCODE]
+    print(f"Killed modules: {len(killed)} ({killed['duration'].sum()/3600:.2f}h of module time), "
+          f"{len(timed_out)} by the time limit ({timed_out['duration'].sum()/3600:.2f}h"
+          f"{f', {time_limit_s:.0f}s each' if time_limit_s is not None else ''})")
+
+    print("\n" + "="*80)
+    print("STRAGGLERS")
+    print("="*80)
+    # A module extends the makespan by however long it keeps running after the last launch
+    df = df.assign(tail=(df["finish"] - last_launch).clip(lower=0))
+    print(f"\nTop {top_n} modules by time running after the last launch:")
+    for _, row in df.nlargest(top_n, ["tail", "duration"]).iterrows():
+        print(f"  {row['module']}: tail={row['tail']:.0f}s, duration={row['duration']:.0f}s, "
+              f"launched at {row['launch']:.0f}s (#{row.name + 1}), retcode={row['retcode']}")
+    print(f"\nTop {top_n} modules by duration:")
+    for _, row in df.nlargest(top_n, "duration").iterrows():
+        print(f"  {row['module']}: duration={row['duration']:.0f}s, launched at {row['launch']:.0f}s (#{row.name + 1}), retcode={row['retcode']}")
+
+    print("\n" + "="*80)
+    print("ORDERING AND NPROCS")
+    print("="*80)
+    # Launcher overhead (file generation, process spawn) is not part of the durations
+    print("\nReplayed makespan (list scheduling of the observed durations, no launcher overhead):")
+    lpt = np.sort(durations)[::-1]
+    for n in sorted({max(1, nprocs // 4), max(1, nprocs // 2), nprocs, nprocs * 2}):
+        in_order = list_schedule(durations, n)
+        longest_first = list_schedule(lpt, n)
+        print(f"  nprocs={n}: launch order={in_order:.0f}s (efficiency {busy_time / (n * in_order) * 100:.2f}%), "
+              f"longest first={longest_first:.0f}s (efficiency {busy_time / (n * longest_first) * 100:.2f}%)"
+              f"{f', observed={makespan:.0f}s' if n == nprocs else ''}")
+
+    if plot is not None:
+        with plt.rc_context(PLOT_RC):
+            plt.figure(figsize=(12, 6))
+            plt.step(times / 3600, busy, where='post')
+            plt.axhline(y=nprocs, color='gray', linestyle='--', alpha=0.5)
+            plt.xlabel('Time since first launch (h)')
+            plt.ylabel('Busy Workers')
+            plt.grid(True, alpha=0.3)
+            save_plot(plot)
+        print(f"\nSaved occupancy plot to {plot.with_suffix('.pdf')}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Analyze module scheduling from launcher timestamps')
+    parser.add_argument('evaluate_files', type=Path, help='evaluateFiles.txt written by the launcher')
+    parser.add_argument('--nprocs', type=int, default=None, help='Number of launcher processes (default: max concurrency)')
+    parser.add_argument('--time-limit-s', type=float, default=None, help='Per-module time limit (timeM), for reporting')
+    parser.add_argument('--top', type=int, default=20, help='Number of straggler modules to list')
+    parser.add_argument('--plot', type=Path, default=None, help='Path of the occupancy plot (PDF)')
+    args = parser.parse_args()
+
+    report(parse_evaluate_files(args.evaluate_files), args.nprocs, args.time_limit_s, args.top, args.plot)
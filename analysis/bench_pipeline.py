@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""Benchmark the analysis pipeline on synthetic EvalTactics trees.
+
+For each scale (relative to a full Mathlib run), a synthetic tree is generated
+with `synth_eval_tactics.py`, and the collection scripts and `analyze.py` are
+run on it as separate processes. Wall time, peak RSS (of the script and its
+worker processes together) and throughput of each script are printed and
+appended to `bench_results.jsonl` in the work directory so that runs can be
+compared over time.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from parquet_layout import LAYOUTS
+from synth_eval_tactics import MATHLIB_MODULES, generate
+
+analysis_dir = Path(__file__).resolve().parent
+
+# How often the RSS of the process tree is sampled, in s
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=analysis_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def tree_rss(root: int) -> int:
+    """Current RSS in bytes of `root` and all its descendants, from `/proc`."""
+    children = {}
+    rss = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue  # exited while scanning
+        pid = int(stat.parent.name)
+        children.setdefault(int(fields[1]), []).append(pid)
+        rss[pid] = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    total, stack = 0, [root]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def run_measured(cmd: list[str], stdout_path: Path) -> tuple[float, int, int]:
+    """Run `cmd` and return (wall time in s, peak RSS in MB of its process tree, of its largest process).
+
+    The tree peak is the maximum of the summed RSS of `cmd` and its worker
+    processes, sampled every `RSS_SAMPLE_INTERVAL`. `ru_maxrss` alone only
+    covers the largest single process, which undercounts the scripts that
+    use a multiprocessing pool.
+    """
+    start = time.monotonic()
+    peak = 0
+    with open(stdout_path, "w") as out:
+        proc = subprocess.Popen(cmd, stdout=out, stderr=subprocess.DEVNULL)
+        while True:
+            pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+            if pid != 0:
+                break
+            peak = max(peak, tree_rss(proc.pid))
+            time.sleep(RSS_SAMPLE_INTERVAL)
+    elapsed = time.monotonic() - start
+    retcode = os.waitstatus_to_exitcode(status)
+    if retcode != 0:
+        raise subprocess.CalledProcessError(retcode, cmd)
+    # ru_maxrss is in KB on Linux
+    return elapsed, max(peak // 2**20, rusage.ru_maxrss // 1024), rusage.ru_maxrss // 1024
+
+
+def dir_size(path: Path, pattern: str) -> int:
+    return sum(f.stat().st_size for f in path.rglob(pattern))
+
+
+def bench_scale(scale: float, work_dir: Path, seed: int, keep: bool, layout: str) -> list[dict]:
+    scale_dir = work_dir / f"scale_{scale:g}"
+    data_dir = scale_dir / "EvalTactics"
+    results_dir = scale_dir / "results"
+    modules = max(1, round(scale * MATHLIB_MODULES))
+
+    print(f"\nScale {scale:g}x ({modules} modules)")
+    start = time.monotonic()
+    n_decls, n_records = generate(data_dir, modules, seed=seed)
+    print(f"  Generated {n_decls} declarations, {n_records} aesopstats records in {time.monotonic() - start:.1f}s")
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    steps = [
+        ("collect_results.py", [str(data_dir), str(results_dir), "--layout", layout], (data_dir, "*.result")),
+        ("collect_aesopstats.py", [str(data_dir), str(results_dir), "--layout", layout], (data_dir, "*.aesopstats.*.jsonl")),
+        ("collect_logs.py", [str(data_dir), str(results_dir)], (data_dir, "*.log")),
+        ("analyze.py", [str(results_dir), str(results_dir)], (results_dir, "*.parquet")),
+    ]
+    rows = []
+    for script, script_args, inputs in steps:
+        input_bytes = dir_size(*inputs)
+        stdout_path = results_dir / ("analysis.txt" if script == "analyze.py" else f"{Path(script).stem}.txt")
+        elapsed, peak_mb, process_peak_mb = run_measured([sys.executable, str(analysis_dir / script), *script_args], stdout_path)
+        row = {
+            "scale": scale,
+            "modules": modules,
+            "declarations": n_decls,
+            "aesopstats_records": n_records,
+            "script": script,
+            "layout": layout,
+            "seconds": round(elapsed, 3),
+            "peak_rss_mb": peak_mb,
+            "max_process_rss_mb": process_peak_mb,
+            "input_mb": round(input_bytes / 2**20, 2),
+            "mb_per_s": round(input_bytes / 2**20 / elapsed, 2),
+            "decls_per_s": round(n_decls / elapsed, 1),
+        }
+        print(f"  {script:<22} {elapsed:8.2f}s  {peak_mb:7d} MB peak ({process_peak_mb} MB largest process)  "
+              f"{row['mb_per_s']:8.2f} MB/s  {row['decls_per_s']:10.1f} decls/s")
+        rows.append(row)
+
+    if not keep:
+        shutil.rmtree(scale_dir)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the analysis pipeline on synthetic data')
+    parser.add_argument('work_dir', type=Path, help='Directory for synthetic data and benchmark results')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 50],
+                        help=f'Scales relative to a full Mathlib run ({MATHLIB_MODULES} modules)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic data')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated data and results')
+    parser.add_argument('--layout', choices=LAYOUTS, default='file', help='Parquet layout written by the collectors')
+    args = parser.parse_args()
+
+    args.work_dir.mkdir(parents=True, exist_ok=True)
+    revision = git_revision()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    history_file = args.work_dir / "bench_results.jsonl"
+    for scale in args.scales:
+        rows = bench_scale(scale, args.work_dir, args.seed, args.keep, args.layout)
+        with open(history_file, "a") as f:
+            for row in rows:
+                f.write(json.dumps({"timestamp": timestamp, "revision": revision, **row}) + "\n")
+    print(f"\nAppended results to {history_file}")
@@ -5,19 +5,22 @@ import pandas as pd
 from multiprocessing import Pool
 import duckdb
 import argparse
+import parquet_layout
 
 def process_files_to_parquet(args):
-    worker_id, files, output_dir = args
+    worker_id, files, data_dir, output_dir = args
     output_file = output_dir / f"aesopstats_worker_{worker_id}.parquet"
 
     def record_generator():
         for file in files:
             tactic = file.stem.split(".aesopstats.")[-1]
+            module = parquet_layout.module_name(file, data_dir, ".aesopstats.")
             with open(file) as f:
                 for line in f:
                     try:
                         record = json.loads(line)
                         record["tactic"] = tactic
+                        record["module"] = module
                         yield record
                     except json.JSONDecodeError:
                         pass
@@ -32,6 +35,8 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Collect Aesop statistics from JSONL files')
     parser.add_argument('data_dir', type=Path, help='Data directory containing aesopstats files')
     parser.add_argument('output_dir', type=Path, help='Output directory for parquet file')
+    parser.add_argument('--layout', choices=parquet_layout.LAYOUTS, default='file',
+                        help='Single aesopstats.parquet file, or aesopstats/ dataset partitioned by tactic (and top-level module)')
     args = parser.parse_args()
     
     data_dir = args.data_dir
@@ -43,7 +48,7 @@ if __name__ == '__main__':
     # Distribute files across workers
     num_workers = Pool()._processes or 1
     chunks = [files[i::num_workers] for i in range(num_workers)]
-    worker_args = [(i, chunk, output_dir) for i, chunk in enumerate(chunks) if chunk]
+    worker_args = [(i, chunk, data_dir, output_dir) for i, chunk in enumerate(chunks) if chunk]
 
     with Pool() as pool:
         results = pool.map(process_files_to_parquet, worker_args)
@@ -53,14 +58,11 @@ if __name__ == '__main__':
     worker_files = [r[2] for r in results if r[2]]
 
     # Use DuckDB to merge with union_by_name
-    output_file = output_dir / "aesopstats.parquet"
     con = duckdb.connect()
     file_list = ', '.join(f"'{f}'" for f in worker_files)
-    con.execute(f"""
-        COPY (
-            SELECT * FROM read_parquet([{file_list}], union_by_name=true)
-        ) TO '{output_file}' (FORMAT PARQUET, COMPRESSION ZSTD)
-    """)
+    output_file = parquet_layout.write(
+        con, f"SELECT * FROM read_parquet([{file_list}], union_by_name=true)",
+        output_dir, "aesopstats", args.layout)
 
     # Clean up worker files
     for f in worker_files:
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+import hashlib
+import re
+from pathlib import Path
+import pandas as pd
+from multiprocessing import Pool
+import duckdb
+import argparse
+
+tactics = [
+    "testUnknownConstant",
+    "useAesop",
+    "useAesopPUnsafeNew",
+    "useAesopPUnsafeOld",
+    "useSaturateNewDAss",
+    "useSaturateOldDAs",
+]
+
+testing_re = re.compile(r'Testing tactic (\d+) \|\| (.*?) : ')
+elapsed_re = re.compile(r'Elapsed time : (\d+) ms, (\d+) hb$')
+
+# (outcome, pattern) pairs for exception messages, checked in order
+exception_classes = [
+    ("timeout", re.compile(r'Timed out after')),
+    ("heartbeats", re.compile(r'maximum number of heartbeats')),
+    ("max_recursion", re.compile(r'maximum recursion depth')),
+    ("aesop_rule_limit", re.compile(r'maximum number of rule applications')),
+    ("aesop_depth_limit", re.compile(r'maximum rule application depth')),
+    ("aesop_failed", re.compile(r'aesop: failed to prove the goal')),
+    ("unknown_constant", re.compile(r'unknown constant|contains unknown constant')),
+]
+
+results = {
+    "Result.success": "success",
+    "Result.nonProp": "non_prop",
+    "Result.typeCheckFail": "type_check_fail",
+    "Result.typeUnequal": "type_unequal",
+    "Result.nonterminate": "nonterminate",
+    "Result.subGoals": "subgoals",
+}
+
+def classify(message: list[str]) -> str:
+    if not message:
+        return "killed"
+    if message[0] in results:
+        return results[message[0]]
+    text = "\n".join(message)
+    for outcome, pattern in exception_classes:
+        if pattern.search(text):
+            return outcome
+    return "other_exception"
+
+def message_hash(message: list[str]) -> str:
+    normalized = re.sub(r'\d+', '#', "\n".join(message))
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+def parse_log(file: Path, module: str, messages: dict):
+    """Stream the blocks of one module log, yielding one record per tactic run."""
+    repetitions: dict[tuple[str, int], int] = {}
+    block = None
+    message: list[str] = []
+
+    def finish(ms, hb):
+        decl, idx = block
+        rep = repetitions.get(block, 0)
+        repetitions[block] = rep + 1
+        outcome = classify(message)
+        h = message_hash(message)
+        if h not in messages:
+            messages[h] = [outcome, "\n".join(message)[:500], 0]
+        messages[h][2] += 1
+        return {
+            "module": module,
+            "declaration": decl,
+            "tactic": tactics[idx] if idx < len(tactics) else str(idx),
+            "repetition": rep,
+            "outcome": outcome,
+            "message_hash": h,
+            "ms": ms,
+            "hb": hb,
+        }
+
+    with open(file, errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            match = testing_re.match(line)
+            if match:
+                if block is not None:
+                    # Previous run never finished (should only happen when the module was killed)
+                    yield finish(None, None)
+                block = (match.group(2), int(match.group(1)))
+                message = []
+                continue
+            if block is None:
+                continue
+            match = elapsed_re.match(line)
+            if match:
+                yield finish(int(match.group(1)), int(match.group(2)))
+                block = None
+            elif message or line.startswith("Result."):
+                # Lines before the first `Result.` belong to the pretty-printed type
+                message.append(line)
+    if block is not None:
+        yield finish(None, None)
+
+def process_files_to_parquet(args):
+    worker_id, files, data_dir, output_dir = args
+    output_file = output_dir / f"logresults_worker_{worker_id}.parquet"
+    messages = {}
+
+    def record_generator():
+        for file in files:
+            module = ".".join(file.relative_to(data_dir).with_suffix("").parts)
+            yield from parse_log(file, module, messages)
+
+    df = pd.DataFrame(record_generator())
+    if len(df) > 0:
+        df = df.astype({"ms": "Int64", "hb": "Int64"})
+        df.to_parquet(output_file, compression="zstd", index=False)
+        return len(df), output_file, messages
+    return 0, None, messages
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Collect per-run outcomes from module .log files')
+    parser.add_argument('data_dir', type=Path, help='Data directory containing log files')
+    parser.add_argument('output_dir', type=Path, help='Output directory for parquet files')
+    args = parser.parse_args()
+
+    data_dir = args.data_dir
+    output_dir = args.output_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    files = list(data_dir.rglob("*.log"))
+    if not files:
+        raise SystemExit(f"No .log files in {data_dir}")
+
+    # Distribute files across workers
+    num_workers = Pool()._processes or 1
+    chunks = [files[i::num_workers] for i in range(num_workers)]
+    worker_args = [(i, chunk, data_dir, output_dir) for i, chunk in enumerate(chunks) if chunk]
+
+    with Pool() as pool:
+        results = pool.map(process_files_to_parquet, worker_args)
+
+    total_rows = sum(r[0] for r in results)
+    worker_files = [r[1] for r in results if r[1]]
+
+    # Merge message examples; counts are summed across workers
+    messages = {}
+    for _, _, worker_messages in results:
+        for h, (outcome, example, count) in worker_messages.items():
+            if h in messages:
+                messages[h][2] += count
+            else:
+                messages[h] = [outcome, example, count]
+    messages_file = output_dir / "logmessages.parquet"
+    pd.DataFrame(
+        [(h, outcome, example, count) for h, (outcome, example, count) in messages.items()],
+        columns=["message_hash", "outcome", "message", "count"],
+    ).to_parquet(messages_file, compression="zstd", index=False)
+
+    output_file = output_dir / "logresults.parquet"
+    con = duckdb.connect()
+    file_list = ', '.join(f"'{f}'" for f in worker_files)
+    con.execute(f"""
+        COPY (
+            SELECT * FROM read_parquet([{file_list}], union_by_name=true)
+        ) TO '{output_file}' (FORMAT PARQUET, COMPRESSION ZSTD)
+    """)
+
+    # Clean up worker files
+    for f in worker_files:
+        f.unlink()
+
+    print(f"Created {output_file} with {total_rows} rows from {len(files)} logs")
+    print(f"Created {messages_file} with {len(messages)} distinct messages")
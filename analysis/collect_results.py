@@ -3,10 +3,14 @@ import re
 import pandas as pd
 from pathlib import Path
 import argparse
+import duckdb
+import parquet_layout
 
 parser = argparse.ArgumentParser(description='Collect results from .result files')
 parser.add_argument('data_dir', type=Path, help='Data directory containing result files')
 parser.add_argument('output_dir', type=Path, help='Output directory for parquet file')
+parser.add_argument('--layout', choices=parquet_layout.LAYOUTS, default='file',
+                    help='Single gatheredresult.parquet file, or gatheredresult/ dataset partitioned by tactic (and top-level module)')
 args = parser.parse_args()
 
 data_dir = args.data_dir
@@ -27,6 +31,7 @@ errors = {"no_match": 0, "wrong_length": 0, "misformatted_result": 0}
 def process_lines():
     result_files = list(data_dir.rglob("*.result"))
     for file in result_files:
+        module = parquet_layout.module_name(file, data_dir, ".result")
         with open(file) as f:
             for line in f:
                 if not line.strip() or not line[0].isdigit():
@@ -53,6 +58,7 @@ def process_lines():
                             yield {
                                 "tactic": tactic,
                                 "declaration": decl,
+                                "module": module,
                                 "success": status == "S",
                                 "time": time
                             }
@@ -63,7 +69,8 @@ def process_lines():
                     continue
 
 df = pd.DataFrame(process_lines())
-output_file = output_dir / "gatheredresult.parquet"
-df.to_parquet(output_file, compression="zstd")
+con = duckdb.connect()
+con.register("gathered_df", df)
+output_file = parquet_layout.write(con, "SELECT * FROM gathered_df", output_dir, "gatheredresult", args.layout)
 print(f"Created {output_file} with {len(df)} rows")
 print(f"Errors: {errors}")
@@ -0,0 +1,84 @@
+"""Hive-partitioned Parquet layout for the collected results.
+
+Instead of a single `<name>.parquet` file, a dataset is written to a `<name>/`
+directory with one subdirectory per tactic (`tactic=useAesop/`), optionally
+split further by top-level module (`module_root=Mathlib.Algebra/`). Within a
+partition, rows are sorted by declaration and written in row groups of
+`ROW_GROUP_SIZE` rows, so DuckDB can skip partitions on `tactic`/`module_root`
+filters and row groups on `declaration` using the min/max statistics.
+"""
+import shutil
+from pathlib import Path
+
+import duckdb
+
+LAYOUTS = ['file', 'tactic', 'tactic-module']
+
+# Aesop statistics rows are large (nested ruleStats/goalStats), so keep row groups small
+ROW_GROUP_SIZE = 16384
+
+def module_name(file: Path, data_dir: Path, suffix: str) -> str:
+    """Module of a result file, e.g. `Mathlib/Algebra/Group.aesopstats.useAesop.jsonl` -> `Mathlib.Algebra.Group`."""
+    rel = file.relative_to(data_dir)
+    return ".".join(rel.parent.parts + (rel.name.split(suffix)[0],))
+
+def write(con: duckdb.DuckDBPyConnection, select: str, output_dir: Path, name: str, layout: str,
+          row_group_size: int = ROW_GROUP_SIZE) -> Path:
+    """Write the rows of `select` (with `tactic`, `declaration` and `module` columns) in `layout`."""
+    if layout == 'file':
+        output = output_dir / f"{name}.parquet"
+        con.execute(f"COPY ({select}) TO '{output}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+        return output
+
+    partitions = ['tactic'] if layout == 'tactic' else ['tactic', 'module_root']
+    module_root = ", array_to_string(string_split(module, '.')[1:2], '.') as module_root" if 'module_root' in partitions else ""
+    output = output_dir / name
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {name}_rows AS SELECT *{module_root} FROM ({select})")
+    # The PARTITION_BY writer does not keep the input order, so each partition gets its own ordered COPY
+    keys = con.execute(f"SELECT DISTINCT {', '.join(partitions)} FROM {name}_rows").fetchall()
+    shutil.rmtree(output, ignore_errors=True)
+    for key in keys:
+        partition_dir = output.joinpath(*(f"{p}={v}" for p, v in zip(partitions, key)))
+        partition_dir.mkdir(parents=True)
+        condition = " AND ".join(f"{p} = '{str(v).replace(chr(39), chr(39) * 2)}'" for p, v in zip(partitions, key))
+        con.execute(f"""
+            COPY (
+                SELECT * EXCLUDE ({', '.join(partitions)})
+                FROM {name}_rows
+                WHERE {condition}
+                ORDER BY declaration
+            ) TO '{partition_dir / 'data_0.parquet'}' (
+                FORMAT PARQUET, COMPRESSION ZSTD,
+                ROW_GROUP_SIZE {row_group_size}
+            )
+        """)
+    con.execute(f"DROP TABLE {name}_rows")
+    unsorted = unsorted_files(con, output)
+    if unsorted:
+        raise RuntimeError(f"Partition files not sorted by declaration: {', '.join(unsorted)}")
+    return output
+
+def unsorted_files(con: duckdb.DuckDBPyConnection, dataset: Path) -> list[str]:
+    """Files of `dataset` whose row groups are not in declaration order, from the Parquet min/max statistics."""
+    rows = con.execute(f"""
+        SELECT file_name
+        FROM (
+            SELECT
+                file_name,
+                stats_min_value,
+                lag(stats_max_value) OVER (PARTITION BY file_name ORDER BY row_group_id) as prev_max
+            FROM parquet_metadata('{dataset}/**/*.parquet')
+            WHERE path_in_schema = 'declaration'
+        )
+        WHERE stats_min_value < prev_max
+        GROUP BY file_name
+        ORDER BY file_name
+    """).fetchall()
+    return [r[0] for r in rows]
+
+def source(input_dir: Path, name: str) -> str:
+    """Table expression reading dataset `name` from `input_dir`, whichever layout it was written in."""
+    dataset = input_dir / name
+    if not dataset.is_dir():
+        return f"'{input_dir / f'{name}.parquet'}'"
+    return f"read_parquet('{dataset}/**/*.parquet', hive_partitioning=true, hive_types_autocast=false)"
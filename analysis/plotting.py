@@ -0,0 +1,11 @@
+"""Plot settings shared by the analysis scripts."""
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+PLOT_RC = {'font.size': 18}
+
+def save_plot(path: Path):
+    """Save current figure as PDF and record for plots.tex."""
+    plt.savefig(path.with_suffix('.pdf'), bbox_inches='tight')
+    plt.close()
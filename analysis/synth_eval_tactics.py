@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+"""Generate a synthetic EvalTactics result tree.
+
+The tree mimics what `evalTacticsAtMathlibHumanTheorems` writes: per-module
+`.name`, `.log`, `.result` and `.aesopstats.<tactic>.jsonl` files plus the top-level
+`evaluateFiles.txt` and `allTheorems.txt`. Sizes and timings are drawn from
+heavy-tailed distributions calibrated against the natural benchmark
+(~27 theorems per Mathlib module, ~2.3 Aesop stats records per theorem and
+repetition), so the analysis scripts can be exercised at scale offline.
+"""
+import argparse
+import heapq
+import json
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+# Number of Mathlib modules evaluated by a full run (1x scale)
+MATHLIB_MODULES = 7500
+
+# Order of the tactics in `test_scripts/tactics.sh`
+tactics = [
+    "testUnknownConstant",
+    "useAesop",
+    "useAesopPUnsafeNew",
+    "useAesopPUnsafeOld",
+    "useSaturateNewDAss",
+    "useSaturateOldDAs",
+]
+aesop_stats_tactics = tactics[1:]
+
+MAX_HEARTBEATS = 200_000 * 1000
+
+# Launcher timestamps in `evaluateFiles.txt`: monotonic clock origin and
+# wall clock (ms since the Unix epoch) of 2026-01-08T12:00:00Z
+MONO_START_MS = 1_000_000
+WALL_START_MS = 1_767_873_600_000
+
+areas = ["Algebra", "Analysis", "CategoryTheory", "Data", "GroupTheory", "LinearAlgebra",
+         "MeasureTheory", "NumberTheory", "Order", "RingTheory", "SetTheory", "Topology"]
+subareas = ["Basic", "Defs", "Lemmas", "Order", "Prod", "Pi", "Finset", "Hom", "Instances", "Ring"]
+namespaces = ["Nat", "Int", "Finset", "Set", "List", "Function", "Ideal", "Submodule",
+              "MeasureTheory", "Filter", "Polynomial", "Matrix", "IsOpen", "Equiv"]
+words = ["add", "mul", "le", "lt", "comm", "assoc", "map", "comp", "inj", "mem", "sub",
+         "zero", "one", "image", "preimage", "iff", "of", "eq", "ne", "pos", "top", "bot"]
+aesop_failures = [
+    "aesop: failed to prove the goal after exhaustive search.",
+    "aesop: maximum number of rule applications (200) reached. "
+    "Set the 'maxRuleApplications' option to increase the limit.",
+    "aesop: failed to prove the goal. Some goals were not explored because the maximum rule application "
+    "depth (30) was reached. Set option 'maxRuleApplicationDepth' to increase the limit.",
+]
+builders = ["apply", "simp", "intros", "subst", "destructProducts", "splitTarget",
+            "cases", "constructors", "tactic", "unfold"]
+
+
+def uniq_repr(name: str) -> str:
+    """Python port of `EvalAuto.Name.uniqRepr` for string components."""
+    return "".join(c.replace("\\", "\\\\").replace("\n", "\\n") + "." for c in name.split("."))
+
+
+def module_names(n: int, rng: np.random.Generator) -> list[str]:
+    names = []
+    for i in range(n):
+        area = areas[rng.integers(len(areas))]
+        sub = subareas[rng.integers(len(subareas))]
+        names.append(f"Mathlib.{area}.{sub}.M{i:06d}")
+    return names
+
+
+def decl_name(rng: np.random.Generator, i: int) -> str:
+    ns = namespaces[rng.integers(len(namespaces))]
+    parts = rng.choice(words, size=rng.integers(2, 5))
+    prime = "'" if rng.random() < 0.1 else ""
+    return f"{ns}.{'_'.join(parts)}_{i}{prime}"
+
+
+def lemma_name(k: int) -> str:
+    """Name of the `k`-th lemma in the premise pool shared by all problems."""
+    return f"{namespaces[k % len(namespaces)]}.{words[k // 14 % len(words)]}_{words[k // 308 % len(words)]}_{k}"
+
+
+def lognormal_ns(rng: np.random.Generator, median_ms: float, sigma: float) -> int:
+    return int(rng.lognormal(np.log(median_ms * 1e6), sigma))
+
+
+class Problem:
+    """Latent properties of a single theorem, shared by all tactics."""
+
+    def __init__(self, rng: np.random.Generator, name: str):
+        self.name = name
+        ns = name.split(".")[0]
+        self.type = (f"∀ (x : {ns}), P x → Q x" if rng.random() < 0.8
+                     else f"∀ {{α : Type u_1}} [inst : {ns} α] (s t : Set α),\n    s ⊆ t → {ns}.card s ≤ {ns}.card t")
+        # Premises used in the human proof; heavy-tailed count, Zipf-distributed popularity
+        n_premises = min(int(rng.pareto(1.6) * 3) + 1, 120)
+        self.premises = list(dict.fromkeys(lemma_name(int(k)) for k in rng.zipf(1.3, size=n_premises) % 100_000))
+        self.goals = min(int(rng.lognormal(1.6, 1.0)) + 1, 200)
+        self.max_depth = min(int(rng.geometric(0.25)), 60)
+        self.lctx = int(rng.lognormal(2.2, 0.6)) + 1
+        # Base cost of the search in ms, before forward reasoning overhead
+        self.base_ms = rng.lognormal(3.5, 1.4)
+        if rng.random() < 0.04:
+            self.base_ms *= rng.uniform(20, 300)  # Hard problems that run into the timeout
+        self.solvable = {
+            "testUnknownConstant": True,
+            "useAesop": rng.random() < 0.18,
+            "useAesopPUnsafe": rng.random() < 0.42,
+            "useSaturate": rng.random() < 0.35,
+        }
+        # Per-rule number of instantiations; drives the naive/incremental gap
+        self.instantiations = [int(rng.pareto(1.3) * 2) for _ in self.premises]
+        # Harness overhead outside Aesop (elaboration, kernel check) in ms
+        self.overhead_ms = rng.lognormal(0.7, 0.6)
+        self.check_ms = rng.lognormal(1.0, 1.0)
+        # Heartbeats are deterministic, so the allocation rate is fixed per problem
+        self.hb_per_ms = 20_000 * rng.lognormal(0, 0.4)
+        # Aesop writes stats for a subset of tactic runs only
+        self.has_stats = {t: rng.random() < 0.5 for t in aesop_stats_tactics}
+
+
+def forward_state_stats(rng: np.random.Generator, problem: Problem, incremental: bool) -> dict:
+    if not incremental:
+        return {"ruleStateStats": []}
+    rule_states = []
+    for premise, inst in zip(problem.premises, problem.instantiations):
+        clusters = []
+        for _ in range(1 + int(rng.random() < 0.3)):
+            n = max(0, int(inst * rng.uniform(0.5, 1.0)))
+            clusters.append({"instantiationStats": [{"slot": int(s)} for s in rng.integers(0, 4, size=n)]})
+        rule_states.append({"rule": premise, "clusterStateStats": clusters})
+    return {"ruleStateStats": rule_states}
+
+
+def aesop_record(rng: np.random.Generator, problem: Problem, tactic: str, file: str,
+                 solved: bool, total_ns: int) -> dict:
+    incremental = "New" in tactic
+    with_premises = tactic != "useAesop"
+    forward = "PUnsafe" in tactic or "Saturate" in tactic
+    saturate = "Saturate" in tactic
+
+    n_goals = problem.goals if not saturate else max(1, problem.goals // 4)
+    goal_stats = []
+    for g in range(n_goals):
+        depth = min(problem.max_depth, int(g ** 0.5))
+        goal_stats.append({
+            "depth": depth,
+            "lctxSize": problem.lctx + depth,
+            "forwardStateStats": forward_state_stats(rng, problem, incremental) if forward and g < 8
+                                 else {"ruleStateStats": []},
+        })
+    if goal_stats:
+        goal_stats[-1]["depth"] = problem.max_depth if not saturate else min(problem.max_depth, 2)
+
+    rule_stats = []
+    for _ in range(int(n_goals * rng.uniform(1.0, 2.5))):
+        if forward and rng.random() < 0.5:
+            rule = {"name": problem.premises[rng.integers(len(problem.premises))],
+                    "builder": "forward", "phase": "unsafe", "scope": "local"}
+        else:
+            builder = builders[rng.integers(len(builders))]
+            rule = {"name": f"Aesop.BuiltinRules.{builder}", "builder": builder, "phase": "safe", "scope": "global"}
+        rule_stats.append({"rule": rule, "elapsed": lognormal_ns(rng, 0.2, 1.5),
+                           "successful": bool(rng.random() < 0.6)})
+
+    config_parsing = lognormal_ns(rng, 0.05, 0.5)
+    rule_set_construction = lognormal_ns(rng, 0.5 + 0.1 * len(problem.premises), 0.4)
+    remaining = max(0, total_ns - config_parsing - rule_set_construction)
+    forward_state = int(remaining * rng.uniform(0.05, 0.3)) if forward and incremental else 0
+    rule_selection = int(remaining * (rng.uniform(0.2, 0.6) if forward and not incremental else rng.uniform(0.02, 0.1)))
+    script = int(remaining * rng.uniform(0.0, 0.05)) if solved else 0
+    search = max(0, remaining - forward_state - rule_selection - script)
+    if saturate:
+        syntax = f"saturate 10 [{', '.join(problem.premises)}]"
+    elif with_premises:
+        syntax = "aesop " + " ".join(f"(add 99% forward {p})" for p in problem.premises)
+    else:
+        syntax = "aesop"
+    return {
+        "declaration": problem.name,
+        "file": file,
+        "syntax": syntax,
+        "goalSolved": solved,
+        "total": total_ns,
+        "configParsing": config_parsing,
+        "ruleSetConstruction": rule_set_construction,
+        "search": search,
+        "ruleSelection": rule_selection,
+        "script": script,
+        "forwardState": forward_state,
+        "ruleStats": rule_stats,
+        "goalStats": goal_stats,
+    }
+
+
+def heartbeat_message(rng: np.random.Generator) -> str:
+    where = ["whnf", "isDefEq", "elaborator", "simp"][rng.integers(4)]
+    return (f"Result.exception ::\n(deterministic) timeout at `{where}`, maximum number of heartbeats "
+            f"({MAX_HEARTBEATS // 1000}) has been reached\n"
+            "Use `set_option maxHeartbeats <num>` to set the limit.\n\n"
+            "Additional diagnostic information may be available using the `set_option diagnostics true` command.")
+
+
+def run_tactic(rng: np.random.Generator, problem: Problem, tactic: str, jitter: float,
+               timeout_ms: int | None):
+    """Return (concise result, time in ms, heartbeats, Aesop total in ns or None, log message)."""
+    if tactic == "testUnknownConstant":
+        ms = max(0, int(rng.lognormal(0.5, 0.5)))
+        return "S", ms, ms * 5000, None, "Result.success"
+    family = "useAesopPUnsafe" if "PUnsafe" in tactic else "useSaturate" if "Saturate" in tactic else "useAesop"
+    solved = problem.solvable[family]
+    base = problem.base_ms * (0.3 if family == "useSaturate" else 1.0)
+    if tactic in ("useAesopPUnsafeOld", "useSaturateOldDAs"):
+        # The naive implementation rescans all instantiations at every goal
+        base *= 1 + 0.002 * problem.goals * sum(problem.instantiations) ** 0.8
+    elif tactic in ("useAesopPUnsafeNew", "useSaturateNewDAss"):
+        base *= 1 + 0.02 * len(problem.premises) + 0.001 * problem.max_depth ** 2
+    hb = int(base * problem.hb_per_ms)
+    if hb > MAX_HEARTBEATS:
+        base = MAX_HEARTBEATS / problem.hb_per_ms
+        hb = MAX_HEARTBEATS
+        solved = False
+    total_ms = base * jitter
+    if rng.random() < 0.01:
+        total_ms *= rng.uniform(1.3, 3.0)  # Occasional noisy repetition
+    overhead_ms = (problem.overhead_ms + (problem.check_ms if solved else 0)) * jitter
+    if timeout_ms is not None and total_ms + overhead_ms > timeout_ms:
+        return ("E", timeout_ms + int(rng.integers(0, 40)), hb, int(total_ms * 1e6),
+                f"Result.exception ::\nTimed out after {timeout_ms}ms")
+    if hb == MAX_HEARTBEATS:
+        return "E", int(total_ms + overhead_ms), hb, int(total_ms * 1e6), heartbeat_message(rng)
+    if solved and rng.random() < 0.005:
+        solved = False  # Rare inconsistent success between repetitions
+    status = "S" if solved else ("G" if family == "useSaturate" or rng.random() < 0.2 else "E")
+    if status == "E":
+        message = "Result.exception ::\n" + aesop_failures[rng.choice(3, p=[0.7, 0.2, 0.1])]
+    else:
+        message = "Result.success" if status == "S" else "Result.subGoals"
+    return status, int(total_ms + overhead_ms), hb, int(total_ms * 1e6), message
+
+
+def generate_module(args) -> tuple[str, int, int, int]:
+    idx, module, decls_mean, repetitions, timeout_ms, seed, out_dir = args
+    rng = np.random.default_rng([seed, idx])
+    base = out_dir / Path(*module.split("."))
+    base.parent.mkdir(parents=True, exist_ok=True)
+    source_file = f"/home/lean/.lake/packages/mathlib/{'/'.join(module.split('.'))}.lean"
+
+    n_decls = int(rng.negative_binomial(2, 2 / (2 + decls_mean)))
+    problems = [Problem(rng, decl_name(rng, i)) for i in range(n_decls)]
+    with open(base.with_name(base.name + ".name"), "w") as f:
+        f.writelines(uniq_repr(p.name) + "\n" for p in problems)
+
+    stats_files = {t: open(base.with_name(f"{base.name}.aesopstats.{t}.jsonl"), "w")
+                   for t in aesop_stats_tactics}
+    log = open(base.with_name(base.name + ".log"), "w")
+    timeout_repr = "none" if timeout_ms is None else f"(some {timeout_ms})"
+    log.write(f"Config = {{\n  timeout? := {timeout_repr}, maxHeartbeats := {MAX_HEARTBEATS // 1000}, "
+              f"tactics := #[{', '.join(tactics)}], repetitions := {repetitions}\n  nonterminates := #[\n  ]\n}}\n"
+              f"Start time : 2026-01-08T12:00:00.000000000Z\n")
+    lines = []
+    total_ms = 0
+    n_records = 0
+    for problem in problems:
+        for _ in range(repetitions):
+            jitter = rng.lognormal(0, 0.03)
+            results = []
+            for tactic_idx, tactic in enumerate(tactics):
+                status, ms, hb, total_ns, message = run_tactic(rng, problem, tactic, jitter, timeout_ms)
+                log.write(f"\nTimestamp : 2026-01-08T12:00:{total_ms // 1000 % 60:02d}.000000000Z\n"
+                          f"Testing tactic {tactic_idx} || {problem.name} : {problem.type}\n"
+                          f"{message}\nElapsed time : {ms} ms, {hb} hb\n")
+                total_ms += ms
+                results.append(f"{status} {ms} {hb}")
+                if total_ns is not None and tactic in stats_files and problem.has_stats[tactic]:
+                    record = aesop_record(rng, problem, tactic, source_file, status == "S", total_ns)
+                    stats_files[tactic].write(json.dumps(record, separators=(",", ":")) + "\n")
+                    n_records += 1
+            lines.append(f"{len(lines)} #[{', '.join(results)}] {uniq_repr(problem.name)}\n")
+    log.close()
+    for f in stats_files.values():
+        f.close()
+    with open(base.with_name(base.name + ".result"), "w") as f:
+        f.write(f"Total elapsed time : {total_ms} ms\n\nSummary:\n\n")
+        f.writelines(lines)
+    return module, n_decls, n_records, total_ms
+
+
+def schedule(durations: list[tuple[str, int]], nprocs: int, time_limit_ms: int | None,
+             rng: np.random.Generator) -> list[str]:
+    """Lines of `evaluateFiles.txt` for modules launched in order on `nprocs` workers.
+
+    A module runs for its tactic time plus the time to import its dependencies;
+    modules that exceed `time_limit_ms` are killed by `timeout` (exit code 124).
+    """
+    events = []
+    running: list[int] = []
+    now = 0
+    for module, tactic_ms in durations:
+        if len(running) >= nprocs:
+            now = max(now, heapq.heappop(running))
+        # Generating the Lean file and spawning the process
+        now += int(rng.integers(5, 50))
+        duration = tactic_ms + int(rng.lognormal(np.log(15_000), 0.5))
+        retcode = 0
+        if time_limit_ms is not None and duration > time_limit_ms:
+            duration, retcode = time_limit_ms, 124
+        events.append((now, 0, module, None))
+        events.append((now + duration, 1, module, retcode))
+        heapq.heappush(running, now + duration)
+    lines = []
+    for t, _, module, retcode in sorted(events):
+        stamp = f"@ {MONO_START_MS + t} {WALL_START_MS + t}"
+        lines.append(f"{module} {stamp}\n" if retcode is None else f"{module} : {retcode} {stamp}\n")
+    return lines
+
+
+def generate(out_dir: Path, modules: int, decls_per_module: float = 27.0,
+             repetitions: int = 3, timeout_ms: int | None = None, seed: int = 0,
+             procs: int | None = None, nprocs: int = 64, time_limit_s: int | None = None) -> tuple[int, int]:
+    """Write a synthetic tree to `out_dir`; returns (#declarations, #aesopstats records)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    names = module_names(modules, np.random.default_rng(seed))
+    worker_args = [(i, m, decls_per_module, repetitions, timeout_ms, seed, out_dir) for i, m in enumerate(names)]
+    n_decls = 0
+    n_records = 0
+    durations = []
+    with Pool(procs) as pool:
+        for module, decls, records, total_ms in pool.imap(generate_module, worker_args, chunksize=16):
+            durations.append((module, total_ms))
+            n_decls += decls
+            n_records += records
+    # 0 means no limit, like an omitted --timeM
+    time_limit_ms = time_limit_s * 1000 if time_limit_s else None
+    with open(out_dir / "evaluateFiles.txt", "w") as ef:
+        ef.writelines(schedule(durations, nprocs, time_limit_ms, np.random.default_rng([seed, modules])))
+    (out_dir / "allTheorems.txt").write_text(str(n_decls))
+    return n_decls, n_records
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic EvalTactics result tree')
+    parser.add_argument('output_dir', type=Path, help='Output directory (e.g. .../EvalTactics)')
+    parser.add_argument('--scale', type=float, default=None,
+                        help=f'Size relative to a full Mathlib run ({MATHLIB_MODULES} modules)')
+    parser.add_argument('--modules', type=int, default=100, help='Number of modules (ignored if --scale is given)')
+    parser.add_argument('--decls-per-module', type=float, default=27.0, help='Mean number of theorems per module')
+    parser.add_argument('--repetitions', type=int, default=3, help='Repetitions per tactic and theorem')
+    parser.add_argument('--timeout-ms', type=int, default=None,
+                        help='Per-tactic timeout in ms (like --timeT); default: heartbeat limit only')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--procs', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--nprocs', type=int, default=64, help='Simulated launcher processes (like --procs of all_experiments.sh)')
+    parser.add_argument('--time-limit-s', type=int, default=None,
+                        help='Simulated per-module time limit (like --timeM); default or 0: no limit')
+    args = parser.parse_args()
+
+    modules = round(args.scale * MATHLIB_MODULES) if args.scale is not None else args.modules
+    n_decls, n_records = generate(args.output_dir, modules, args.decls_per_module,
+                                  args.repetitions, args.timeout_ms, args.seed, args.procs,
+                                  args.nprocs, args.time_limit_s)
+    print(f"Created {args.output_dir} with {modules} modules, {n_decls} declarations, {n_records} aesopstats records")
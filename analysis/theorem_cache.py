@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""Inspect the theorem inventory cache written by the natural benchmark launcher.
+
+`evalTacticsAtMathlibHumanTheorems` stores the human theorems of each Mathlib
+module in `<cache>/<Mathlib revision>-<source hash>/<module path>.name`, where
+the hash covers `lean-toolchain` and the `Eval/` sources (see
+`lean/Eval/TheoremCache.lean`), and appends `hit`/`miss` with the time spent
+preparing the entry to its `usage.txt` on every run. This reports, per
+entry, the toolchain, the inventory size, how it is spread over modules, the disk usage
+and the cache hits.
+
+With `--run`, it also reports the per-module startup time of EvalTactics result
+folders: from the launch line in `evaluateFiles.txt` until the worker has
+loaded its theorem filter (`<module>.startup`, same monotonic clock), next to
+the cache status of that run (`theoremCache.txt`). Comparing a run with the
+cache to one without shows the startup saved per module.
+"""
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+def mathlib_rev(manifest: Path) -> str | None:
+    """Revision of the `mathlib` package in a `lake-manifest.json`."""
+    with open(manifest) as f:
+        return next((p["rev"] for p in json.load(f)["packages"] if p["name"] == "mathlib"), None)
+
+def module_name(file: Path, entry: Path) -> str:
+    """Module of a cached list, e.g. `<entry>/Mathlib/Order/Basic.name` -> `Mathlib.Order.Basic`."""
+    return ".".join(file.relative_to(entry).with_suffix("").parts)
+
+def count_names(path: Path) -> int:
+    """Number of names in a `NameArray.save` file (one name per line)."""
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+def report_entry(entry: Path, top_n: int, current: bool) -> None:
+    complete = (entry / "complete").exists()
+    print(f"\n{entry.name}{' (current Mathlib)' if current else ''}{'' if complete else ' (incomplete, rebuilt on next run)'}")
+    toolchain = entry / "lean-toolchain"
+    if toolchain.exists():
+        print(f"  Toolchain: {toolchain.read_text().strip()}")
+
+    inventory = entry / "allTheorems.name"
+    if inventory.exists():
+        print(f"  Inventory: {count_names(inventory)} human theorems")
+
+    module_files = [f for f in entry.rglob("*.name") if f != inventory]
+    sizes = sorted(((count_names(f), module_name(f, entry)) for f in module_files), reverse=True)
+    in_modules = sum(n for n, _ in sizes)
+    with_theorems = sum(1 for n, _ in sizes if n > 0)
+    print(f"  Modules: {len(sizes)}, {with_theorems} with human theorems, {in_modules} theorems in module lists")
+    if sizes:
+        print(f"  Largest modules: {', '.join(f'{m} ({n})' for n, m in sizes[:top_n])}")
+    disk = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+    print(f"  Disk usage: {disk / 2**20:.1f} MiB")
+
+    usage = entry / "usage.txt"
+    events = []
+    if usage.exists():
+        for line in usage.read_text().splitlines():
+            status, ms, *prepare_ms = line.split()
+            events.append((status, datetime.fromtimestamp(int(ms) / 1e3, timezone.utc),
+                           int(prepare_ms[0]) if prepare_ms else None))
+    print(f"  Runs: {len(events)}, hits={sum(1 for e in events if e[0] == 'hit')}, "
+          f"misses={sum(1 for e in events if e[0] == 'miss')}")
+    for status in ["miss", "hit"]:
+        times = [t for s, _, t in events if s == status and t is not None]
+        if times:
+            print(f"  Inventory preparation on {status}: median={np.median(times) / 1e3:.1f}s over {len(times)} runs")
+    if events:
+        print(f"  Last run: {events[-1][1]:%Y-%m-%d %H:%M} UTC ({events[-1][0]})")
+
+def module_startups(run_dir: Path) -> np.ndarray:
+    """Startup time in s of each module of an EvalTactics folder with `.startup` files."""
+    launches = {}
+    with open(run_dir / "evaluateFiles.txt") as f:
+        for line in f:
+            entry, sep, stamp = line.strip().partition(" @ ")
+            if sep and " : " not in entry:
+                launches[entry] = int(stamp.split()[0])
+    startups = []
+    for file in run_dir.rglob("*.startup"):
+        module = ".".join(file.relative_to(run_dir).with_suffix("").parts)
+        if module in launches:
+            startups.append((int(file.read_text()) - launches[module]) / 1e3)
+    return np.array(startups)
+
+def report_run(run_dir: Path) -> None:
+    status_file = run_dir / "theoremCache.txt"
+    status = status_file.read_text().split()[0] if status_file.exists() else "unknown"
+    startups = module_startups(run_dir)
+    if len(startups) == 0:
+        print(f"\n{run_dir} (cache {status}): no module startup times")
+        return
+    p50, p90 = np.quantile(startups, [0.5, 0.9])
+    print(f"\n{run_dir} (cache {status}): {len(startups)} modules, startup mean={startups.mean():.2f}s, "
+          f"p50={p50:.2f}s, p90={p90:.2f}s, total={startups.sum() / 3600:.2f}h")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report the contents and hit counts of the theorem inventory cache')
+    parser.add_argument('cache_dir', type=Path, help='Cache folder passed to the launcher (theoremCache?)')
+    parser.add_argument('--manifest', type=Path, default=None,
+                        help='lake-manifest.json of the evaluated project, to mark the entries of its Mathlib revision')
+    parser.add_argument('--top', type=int, default=5, help='Number of largest modules to list per entry')
+    parser.add_argument('--run', type=Path, action='append', default=[],
+                        help='EvalTactics folder whose per-module startup times to report (repeatable)')
+    args = parser.parse_args()
+
+    current = mathlib_rev(args.manifest) if args.manifest is not None else None
+    entries = sorted((d for d in args.cache_dir.iterdir() if d.is_dir()), key=lambda d: d.stat().st_mtime) \
+        if args.cache_dir.is_dir() else []
+    print(f"Theorem cache {args.cache_dir}: {len(entries)} entries")
+    def of_current(entry: Path) -> bool:
+        return current is not None and entry.name.startswith(f"{current}-")
+    if current is not None:
+        cached = sum(1 for e in entries if of_current(e) and (e / 'complete').exists())
+        print(f"Current Mathlib revision: {current} ({cached} complete entries, one per toolchain and Eval/ version)")
+    for entry in entries:
+        report_entry(entry, args.top, of_current(entry))
+    for run_dir in args.run:
+        report_run(run_dir)
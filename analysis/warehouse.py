@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""Append-only store of natural benchmark runs, for tracking performance over time.
+
+`add` records one results folder (as written by `all_experiments.sh`) in a DuckDB
+file under a new `run_id`: a metadata row with the experiment flags, machine and
+the Lean toolchain/Aesop/Mathlib revisions, plus the aggregated per-declaration
+tables. Rows of existing runs are never modified.
+
+`report` prints per-tactic median time, p90 and solved counts for each run.
+"""
+import argparse
+import json
+import os
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+
+from analyze import Analysis
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id VARCHAR PRIMARY KEY,
+        started TIMESTAMP,
+        host VARCHAR,
+        machine VARCHAR,
+        cpus INTEGER,
+        toolchain VARCHAR,
+        aesop_rev VARCHAR,
+        mathlib_rev VARCHAR,
+        flags MAP(VARCHAR, VARCHAR)
+    );
+    CREATE TABLE IF NOT EXISTS gathered (
+        run_id VARCHAR,
+        tactic VARCHAR,
+        declaration VARCHAR,
+        success BOOLEAN,
+        time DOUBLE
+    );
+    CREATE TABLE IF NOT EXISTS aesop (
+        run_id VARCHAR,
+        tactic VARCHAR,
+        declaration VARCHAR,
+        goalSolved BOOLEAN,
+        total BIGINT,
+        search BIGINT,
+        script BIGINT,
+        ruleSetConstruction BIGINT,
+        ruleSelection BIGINT,
+        forwardState BIGINT,
+        configParsing BIGINT
+    );
+    CREATE TABLE IF NOT EXISTS outcomes (
+        run_id VARCHAR,
+        tactic VARCHAR,
+        outcome VARCHAR,
+        runs BIGINT,
+        ms BIGINT
+    );
+"""
+
+def manifest_revisions(manifest: Path) -> dict[str, str]:
+    """Revisions of the packages in a `lake-manifest.json`, by package name."""
+    with open(manifest) as f:
+        return {p["name"]: p["rev"] for p in json.load(f)["packages"]}
+
+def parse_flag(value: str) -> tuple[str, str]:
+    key, sep, flag = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected key=value, got '{value}'")
+    return key, flag
+
+def parse_started(value: str) -> datetime:
+    """Seconds since the Unix epoch (`date +%s`) or an ISO 8601 time, UTC unless given."""
+    try:
+        return datetime.fromtimestamp(int(value), timezone.utc)
+    except ValueError:
+        pass
+    try:
+        started = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected seconds since the epoch or an ISO time, got '{value}'")
+    return started if started.tzinfo is not None else started.replace(tzinfo=timezone.utc)
+
+def first_launch(evaluate_files: Path) -> datetime | None:
+    """Wall time of the first module launch in an `evaluateFiles.txt`, if it has launcher timestamps."""
+    if not evaluate_files.exists():
+        return None
+    launches = []
+    with open(evaluate_files) as f:
+        for line in f:
+            entry, sep, stamp = line.strip().partition(" @ ")
+            if sep and " : " not in entry:
+                launches.append(int(stamp.split()[1]))
+    return datetime.fromtimestamp(min(launches) / 1e3, timezone.utc) if launches else None
+
+def add_run(args) -> None:
+    revisions = manifest_revisions(args.manifest)
+    toolchain_file = args.manifest.with_name("lean-toolchain")
+    toolchain = toolchain_file.read_text().strip() if toolchain_file.exists() else None
+    # The experiment start, not the time of recording, which comes after hours of evaluation
+    started = args.started or first_launch(args.results_dir / "evaluateFiles.txt") or datetime.now(timezone.utc)
+    run_id = args.run_id or started.strftime("%Y%m%dT%H%M%SZ")
+
+    analysis = Analysis(args.results_dir)
+    con = analysis.con
+    con.execute(f"ATTACH '{args.warehouse}' AS warehouse")
+    con.execute("USE warehouse")
+    con.execute(SCHEMA)
+    con.execute("USE memory")
+    if con.execute("SELECT COUNT(*) FROM warehouse.runs WHERE run_id = ?", [run_id]).fetchone()[0] > 0:
+        raise SystemExit(f"Run {run_id} already exists in {args.warehouse}")
+
+    flags = dict(args.flag)
+    con.execute("BEGIN TRANSACTION")
+    con.execute("INSERT INTO warehouse.runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, MAP(?, ?))", [
+        run_id, started.replace(tzinfo=None), platform.node(), platform.machine(), os.cpu_count(),
+        toolchain, revisions.get("aesop"), revisions.get("mathlib"),
+        list(flags.keys()), list(flags.values()),
+    ])
+    con.execute("""
+        INSERT INTO warehouse.gathered
+        SELECT ?, tactic, declaration, success, time FROM gathered_unfiltered
+    """, [run_id])
+    con.execute("""
+        INSERT INTO warehouse.aesop
+        SELECT ?, tactic, declaration, goalSolved, total, search, script, ruleSetConstruction,
+            ruleSelection, forwardState, configParsing
+        FROM aesop
+    """, [run_id])
+    if analysis.has_logs:
+        con.execute("""
+            INSERT INTO warehouse.outcomes
+            SELECT ?, tactic, outcome, COUNT(*), SUM(ms) FROM log_raw GROUP BY tactic, outcome
+        """, [run_id])
+    con.execute("COMMIT")
+
+    n_decls = con.execute("SELECT COUNT(*) FROM warehouse.gathered WHERE run_id = ?", [run_id]).fetchone()[0]
+    print(f"Added run {run_id} ({n_decls} (tactic, declaration) results) to {args.warehouse}")
+
+def report(args) -> None:
+    con = duckdb.connect(str(args.warehouse), read_only=True)
+    runs = con.execute(f"""
+        SELECT run_id, started, host, cpus, toolchain, aesop_rev, flags
+        FROM runs
+        ORDER BY started DESC
+        {f"LIMIT {args.last}" if args.last else ""}
+    """).fetchall()
+    if not runs:
+        print(f"No runs in {args.warehouse}")
+        return
+    runs.reverse()
+    run_ids = [r[0] for r in runs]
+
+    print("Runs:")
+    for run_id, started, host, cpus, toolchain, aesop_rev, flags in runs:
+        flag_str = " ".join(f"{k}={v}" for k, v in sorted(flags.items()))
+        print(f"  {run_id}: {started:%Y-%m-%d %H:%M}, {host} ({cpus} cpus), {toolchain}, aesop {(aesop_rev or '?')[:8]}, {flag_str}")
+
+    rows = con.execute(f"""
+        SELECT
+            tactic,
+            run_id,
+            COUNT(*) as decls,
+            COUNT(*) FILTER (WHERE success) as solved,
+            quantile_cont(time, [0.5, 0.9]) as gathered_q,
+            quantile_cont(time, [0.5, 0.9]) FILTER (WHERE success) as solved_q
+        FROM gathered
+        WHERE run_id IN ({', '.join('?' for _ in run_ids)})
+            {"AND tactic = ?" if args.tactic else ""}
+        GROUP BY tactic, run_id
+        ORDER BY tactic
+    """, run_ids + ([args.tactic] if args.tactic else [])).fetchall()
+
+    by_tactic: dict[str, dict[str, tuple]] = {}
+    for tactic, run_id, decls, solved, gathered_q, solved_q in rows:
+        by_tactic.setdefault(tactic, {})[run_id] = (decls, solved, gathered_q, solved_q)
+    for tactic, per_run in by_tactic.items():
+        print(f"\n{tactic} (times in ms, median/p90 over all declarations and over solved ones):")
+        print(f"  {'run':<20} {'decls':>8} {'solved':>8} {'median':>9} {'p90':>9} {'solved median':>14} {'solved p90':>11}")
+        for run_id in run_ids:
+            if run_id not in per_run:
+                continue
+            decls, solved, (p50, p90), solved_q = per_run[run_id]
+            s50, s90 = solved_q if solved_q is not None else (float('nan'), float('nan'))
+            print(f"  {run_id:<20} {decls:>8} {solved:>8} {p50:>9.1f} {p90:>9.1f} {s50:>14.1f} {s90:>11.1f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Record natural benchmark runs and report trends across runs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='Append a results folder as a new run')
+    add_parser.add_argument('results_dir', type=Path, help='Results directory containing parquet files')
+    add_parser.add_argument('warehouse', type=Path, help='DuckDB file with all recorded runs (created if missing)')
+    add_parser.add_argument('--manifest', type=Path, required=True,
+                            help='lake-manifest.json of the evaluated project (lean-toolchain is read next to it)')
+    add_parser.add_argument('--flag', type=parse_flag, action='append', default=[], metavar='KEY=VALUE',
+                            help='Experiment flag to record, e.g. repetitions=3 (repeatable)')
+    add_parser.add_argument('--started', type=parse_started,
+                            help='Experiment start, in seconds since the epoch or ISO 8601 '
+                                 '(default: first module launch in evaluateFiles.txt)')
+    add_parser.add_argument('--run-id', help='Run identifier (default: UTC start time)')
+    add_parser.set_defaults(func=add_run)
+
+    report_parser = subparsers.add_parser('report', help='Print per-tactic time and solved counts across runs')
+    report_parser.add_argument('warehouse', type=Path, help='DuckDB file with all recorded runs')
+    report_parser.add_argument('--tactic', help='Only report this tactic')
+    report_parser.add_argument('--last', type=int, help='Only report the last N runs')
+    report_parser.set_defaults(func=report)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -1,5 +1,6 @@
 import Eval.EvalModule
 import Eval.OS
+import Eval.TheoremCache
 
 namespace EvalAuto
 
@@ -17,6 +18,13 @@ structure EvalTacticOnMathlibConfig where
   moduleFilter  : Name → Bool   := fun _ => true
   nonterminates : Array (RegisteredTactic × Name)
   repetitions   : Nat := 1
+  -- Folder of the theorem inventory cache (see `TheoremCache.prepare`), `.none` to recompute it
+  theoremCache? : Option System.FilePath := .none
+  manifest      : System.FilePath        := "lake-manifest.json"
+
+/-- Suffix ` @ <monotonic ms> <ms since the Unix epoch>` of the lines of `evaluateFiles.txt` -/
+def launcherTimestamp : IO String := do
+  return s!" @ {← IO.monoMsNow} {(← Std.Time.Timestamp.now).toMillisecondsSinceUnixEpoch}"
 
 def evalTacticsAtMathlibHumanTheorems (config : EvalTacticOnMathlibConfig) : CoreM Unit := do
   let mms := (← mathlibModules).filter config.moduleFilter
@@ -25,13 +33,21 @@ def evalTacticsAtMathlibHumanTheorems (config : EvalTacticOnMathlibConfig) : Cor
   if !(← System.FilePath.isDir config.resultFolder) then
     IO.FS.createDir config.resultFolder
   let evaluateFilesHandle ← IO.FS.Handle.mk (config.resultFolder / "evaluateFiles.txt") .write
-  let humanTheorems ← allHumanTheorems
+  let cacheEntry? ← config.theoremCache?.mapM (TheoremCache.prepare · config.manifest)
+  -- Without a cache, the inventory is recomputed for every run
+  let humanTheorems ← if cacheEntry?.isSome then pure #[] else allHumanTheorems
   let allTally ← tallyNamesByModule humanTheorems
-  IO.FS.writeFile (config.resultFolder / "allTheorems.txt") s!"{humanTheorems.size}"
+  let nHumanTheorems := match cacheEntry? with
+    | .some (_, size, _) => size
+    | .none => humanTheorems.size
+  IO.FS.writeFile (config.resultFolder / "allTheorems.txt") s!"{nHumanTheorems}"
+  let cacheStatus := match cacheEntry? with
+    | .some (entry, _, true) => s!"hit {entry}"
+    | .some (entry, _, false) => s!"miss {entry}"
+    | .none => "none"
+  IO.FS.writeFile (config.resultFolder / "theoremCache.txt") cacheStatus
   let mut running := #[]
   for mm in mms do
-    evaluateFilesHandle.putStrLn mm.toString
-    evaluateFilesHandle.flush
     let nComps := mm.components.length
     let paths := (List.range nComps).map (fun i =>
       String.join <| (mm.components.take (i + 1)).map (fun n => "/" ++ n.toString))
@@ -42,9 +58,16 @@ def evalTacticsAtMathlibHumanTheorems (config : EvalTacticOnMathlibConfig) : Cor
     let .some extraLogPath := paths.getLast?
       | throwError "evalAtMathlibHumanTheorems :: Module name {mm} has zero components"
     let logPath := config.resultFolder ++ extraLogPath
-    let validThms := (allTally.get? mm).getD #[]
+    -- Workers load the theorems to evaluate from `namesFile`
+    let (validThms, namesFile) ← match cacheEntry? with
+      | .some (entry, _, _) => do
+        let file := (TheoremCache.moduleFile entry mm).toString
+        pure (← NameArray.load file, file)
+      | .none => pure ((allTally.get? mm).getD #[], logPath ++ ".name")
     NameArray.save validThms (logPath ++ ".name")
-    let ef ← evalFile mm validThms logPath config
+    let ef ← evalFile mm namesFile logPath config
+    evaluateFilesHandle.putStrLn s!"{mm}{← launcherTimestamp}"
+    evaluateFilesHandle.flush
     let evalProc ← EvalProc.create "bash" #[]
     if let .some mlimit := config.memoryLimitKb then
       evalProc.stdin.putStrLn s!"ulimit -v {mlimit}"
@@ -65,20 +88,15 @@ where
       let retCode? ← proc.tryWait
       match retCode? with
       | .some retCode =>
-        evaluateFilesHandle.putStrLn s!"{mm} : {retCode}"
+        evaluateFilesHandle.putStrLn s!"{mm} : {retCode}{← launcherTimestamp}"
         evaluateFilesHandle.flush
       | .none => running' := running'.push (mm, proc)
     return running'
   evalFile
-    (mm : Name) (validThms : Array Name)
+    (mm : Name) (namesFile : String)
     (logPath : String) (config : EvalTacticOnMathlibConfig) : CoreM String := do
     let lb := "{"
     let rb := "}"
-    let thmsStrs : List String :=
-      match validThms.toList.getLast? with
-      | .some last =>
-        validThms.toList.dropLast.map (fun n => s!"  {repr n},") ++ [s!"  {repr last}"]
-      | .none => []
     let nonterms := config.nonterminates
     let nontermsStrs : List String :=
       match nonterms.toList.getLast? with
@@ -96,15 +114,14 @@ where
         "",
         "open Lean EvalAuto",
         "",
-        "def humanThms : Std.HashSet Name := Std.HashSet.ofList ["
-      ] ++ thmsStrs ++ #[
-        "]",
-        "",
         "def nonterms : Array (RegisteredTactic × Name) := #["
       ] ++ nontermsStrs ++ #[
         "]",
         "",
         "def action : CoreM Unit := do",
+        s!"  let humanThms := Std.HashSet.ofArray (← NameArray.load {repr namesFile})",
+        -- Startup: from the launch line in `evaluateFiles.txt` until the theorem filter is ready
+        s!"  IO.FS.writeFile {repr (logPath ++ ".startup")} (toString (← IO.monoMsNow))",
         s!"  let _ ← evalTacticsAtModule ({repr mm}) (fun ci => humanThms.contains ci.name)",
         s!"    {lb} timeout? := {config.timeout?}, maxHeartbeats := {config.maxHeartbeats}, tactics := #[{tacsStr}],",
         s!"      logFile := {repr (logPath ++ ".log")}, resultFile := {repr (logPath ++ ".result")}, aesopStatsPrefix := {repr (logPath ++ ".aesopstats")},",
@@ -190,6 +207,8 @@ def readETMHTEvaluateFiles (config : EvalTacticOnMathlibConfig) : CoreM (Array N
   let mut retEnd := #[]
   let str2Name (s : String) := (s.splitOn ".").foldl (fun cur field => Name.str cur field) Name.anonymous
   for line in lines do
+    -- Drop the launcher timestamp, if any
+    let line := (line.splitOn " @ ").headD line
     if line.contains ':' then
       let [name, retCode] := line.splitOn ":"
         | throwError "{decl_name%} :: Unexpected line format, line content : `{line}`"
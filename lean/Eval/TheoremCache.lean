@@ -0,0 +1,79 @@
+import Eval.ConstAnalysis
+import Eval.EnvAnalysis
+import Std.Time
+
+open Lean
+
+namespace EvalAuto
+
+/-!
+Cache of the human theorem inventory (`allHumanTheorems` split by `tallyNamesByModule`),
+so repeated runs against the same Mathlib skip recomputing it. An entry
+`<cacheFolder>/<Mathlib revision>-<source hash>/` contains
+
+* `allTheorems.name` and `allTheorems.txt`: the whole inventory and its size,
+* `lean-toolchain`: the toolchain the inventory was computed with,
+* `<module path>.name`: the human theorems of each Mathlib module, in `NameArray` format,
+* `complete`: written last, an entry without it is rebuilt,
+* `usage.txt`: one `hit <ms since the Unix epoch> <ms to prepare>` or `miss ...` line per
+  launcher run, where the last field is the time spent loading or building the entry.
+-/
+
+/-- Revision of the `mathlib` package in a `lake-manifest.json` -/
+def mathlibRev (manifest : System.FilePath) : IO String := do
+  let json ← IO.ofExcept <| Json.parse (← IO.FS.readFile manifest)
+  let packages ← IO.ofExcept <| json.getObjValAs? (Array Json) "packages"
+  for pkg in packages do
+    if let .ok "mathlib" := pkg.getObjValAs? String "name" then
+      return (← IO.ofExcept <| pkg.getObjValAs? String "rev")
+  throw <| IO.userError s!"{decl_name%} :: No mathlib package in {manifest}"
+
+/--
+  Name of the cache entry of the project of `manifest`. Besides the Mathlib revision, the
+  inventory depends on the toolchain and on the filter in `Eval/`, so both are hashed into the name
+-/
+def TheoremCache.entryName (manifest : System.FilePath) : IO String := do
+  let sources := (← (manifest.withFileName "Eval").walkDir).filter (·.extension == some "lean")
+  let mut h := hash (← IO.FS.readFile (manifest.withFileName "lean-toolchain"))
+  for src in sources.qsort (·.toString < ·.toString) do
+    h := mixHash h (mixHash (hash src.toString) (hash (← IO.FS.readFile src)))
+  return s!"{← mathlibRev manifest}-{String.ofList (Nat.toDigits 16 h.toNat)}"
+
+/-- `.name` file of module `mm` in the cache entry `entry` -/
+def TheoremCache.moduleFile (entry : System.FilePath) (mm : Name) : System.FilePath :=
+  ⟨(mm.components.foldl (fun path c => path / c.toString) entry).toString ++ ".name"⟩
+
+/--
+  Cache entry for the Mathlib revision in `manifest`, built if missing, the inventory size and
+  whether the entry already existed
+-/
+def TheoremCache.prepare (cacheFolder manifest : System.FilePath) : CoreM (System.FilePath × Nat × Bool) := do
+  let start ← IO.monoMsNow
+  let entry := cacheFolder / (← TheoremCache.entryName manifest)
+  let hit ← (entry / "complete").pathExists
+  if !hit then
+    let mms ← mathlibModules
+    if !(mms.all Name.canBeFilename) then
+      throwError "{decl_name%} :: Some modules have extra-ordinary names. Cache layout needs to be changed!"
+    IO.FS.createDirAll entry
+    let humanTheorems ← allHumanTheorems
+    let allTally ← tallyNamesByModule humanTheorems
+    NameArray.save humanTheorems (entry / "allTheorems.name").toString
+    for mm in mms do
+      let file := TheoremCache.moduleFile entry mm
+      if let .some dir := file.parent then
+        IO.FS.createDirAll dir
+      NameArray.save ((allTally.get? mm).getD #[]) file.toString
+    IO.FS.writeFile (entry / "allTheorems.txt") s!"{humanTheorems.size}"
+    IO.FS.writeFile (entry / "lean-toolchain") (← IO.FS.readFile (manifest.withFileName "lean-toolchain"))
+    IO.FS.writeFile (entry / "complete") ""
+  let .some size := (← IO.FS.readFile (entry / "allTheorems.txt")).toNat?
+    | throwError "{decl_name%} :: Malformed {entry / "allTheorems.txt"}"
+  let elapsed := (← IO.monoMsNow) - start
+  let status := if hit then "hit" else "miss"
+  let usage ← IO.FS.Handle.mk (entry / "usage.txt") .append
+  usage.putStrLn s!"{status} {(← Std.Time.Timestamp.now).toMillisecondsSinceUnixEpoch} {elapsed}"
+  IO.println s!"Theorem cache {status}: {entry} ({size} human theorems, {elapsed}ms)"
+  return (entry, size, hit)
+
+end EvalAuto
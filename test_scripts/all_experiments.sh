@@ -1,6 +1,7 @@
 #!/usr/bin/env bash
 
 repo_path="/home/lean"
+theorem_cache="/home/theorem-cache"
 
 # --- Default values ---
 declare -A flags
@@ -81,8 +82,9 @@ rm -rf $repo_path/Eval*
 rm -rf /home/results
 
 # Run evaluation
-printf "Experiment starts: %(%s)T\n"
-/home/test_scripts/tactics.sh "${flags[procs]}" $repo_path "${flags[nMod]}" "${flags[static]}" "${flags[timeM]}" "${flags[timeT]}" "${flags[mem]}" "${flags[threads]}" "${flags[repetitions]}" "${flags[heartbeats]}"
+started=$(date +%s)
+echo "Experiment starts: $started"
+/home/test_scripts/tactics.sh "${flags[procs]}" $repo_path "${flags[nMod]}" "${flags[static]}" "${flags[timeM]}" "${flags[timeT]}" "${flags[mem]}" "${flags[threads]}" "${flags[repetitions]}" "${flags[heartbeats]}" "$theorem_cache"
 printf "tactics.sh done: %(%s)T\n"
 
 # Gather results
@@ -95,10 +97,35 @@ echo "Gathering Aesop stats ..."
 /home/venv/bin/python /home/analysis/collect_aesopstats.py "$repo_path/EvalTactics" "/home/results"
 printf "Done: %(%s)T\n"
 
-echo "Copying allTheorems.txt ..."
+echo "Gathering log outcomes ..."
+/home/venv/bin/python /home/analysis/collect_logs.py "$repo_path/EvalTactics" "/home/results"
+printf "Done: %(%s)T\n"
+
+echo "Copying allTheorems.txt and evaluateFiles.txt ..."
 cp "$repo_path/EvalTactics/allTheorems.txt" "/home/results/allTheorems.txt"
+cp "$repo_path/EvalTactics/evaluateFiles.txt" "/home/results/evaluateFiles.txt"
+
+echo "Reporting theorem cache ..."
+/home/venv/bin/python /home/analysis/theorem_cache.py "$theorem_cache" --manifest "$repo_path/lake-manifest.json" --run "$repo_path/EvalTactics" > "/home/results/theorem_cache.txt"
 
 # Analyze results
 echo "Analyzing results ..."
 /home/venv/bin/python /home/analysis/analyze.py "/home/results" "/home/results" > "/home/results/analysis.txt"
 printf "Done: %(%s)T\n"
+
+echo "Analyzing module schedule ..."
+time_limit_args=()
+if [[ ${flags[timeM]} =~ ([0-9]+) ]]; then
+  time_limit_args=(--time-limit-s "${BASH_REMATCH[1]}")
+fi
+/home/venv/bin/python /home/analysis/analyze_makespan.py "/home/results/evaluateFiles.txt" --nprocs "${flags[procs]}" "${time_limit_args[@]}" --plot "/home/results/plots/module_occupancy" > "/home/results/makespan.txt"
+printf "Done: %(%s)T\n"
+
+# Record the run in the results warehouse (kept across experiments)
+echo "Recording run in /home/warehouse.duckdb ..."
+flag_args=()
+for key in "${!flags[@]}"; do
+  flag_args+=(--flag "$key=${flags[$key]}")
+done
+/home/venv/bin/python /home/analysis/warehouse.py add "/home/results" "/home/warehouse.duckdb" --manifest "$repo_path/lake-manifest.json" --started "$started" "${flag_args[@]}"
+printf "Done: %(%s)T\n"
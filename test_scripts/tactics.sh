@@ -3,7 +3,7 @@
 # --- Parse required arguments ---
 if [ "$#" -lt 2 ]; then
   echo "Illegal number of parameters"
-  echo "Usage: $0 <number_of_processors> <path_to_eval_repo> <nMod> <static> <timeM> <timeT> <mem> <threads> <repetitions> <maxHeartbeats>"
+  echo "Usage: $0 <number_of_processors> <path_to_eval_repo> <nMod> <static> <timeM> <timeT> <mem> <threads> <repetitions> <maxHeartbeats> [theorem_cache_dir]"
   exit 1
 fi
 
@@ -18,6 +18,12 @@ threads="$8"
 repetitions="$9"
 maxHeartbeats="${10}"
 
+# Theorem inventory cache, reused across runs with the same Mathlib revision
+theoremCache=".none"
+if [ -n "${11}" ]; then
+  theoremCache="(.some \"${11}\")"
+fi
+
 cd "$2"
 
 source ~/.elan/env
@@ -52,6 +58,7 @@ open EvalAuto
       resultFolder := \"./EvalTactics\"
       moduleFilter := mfilter
       repetitions := $repetitions
+      theoremCache? := $theoremCache
       nonterminates :=
         let decls := #[
           \`\`IntermediateField.extendScalars_top,